@@ -1,16 +1,40 @@
-import os
-from dotenv import load_dotenv  # cspell:ignore dotenv
-from flask import Flask
-from flask_smorest import Api
-from app.api import register_blueprints
-from app.database import db
-from urllib.parse import quote_plus
+import time
+
+# Taken before the heavy imports below to measure the import cost
+_import_start = time.perf_counter()
+
+import os  # noqa: E402
+from dotenv import load_dotenv  # cspell:ignore dotenv  # noqa: E402
+from flask import Flask  # noqa: E402
+from flask_smorest import Api  # noqa: E402
+from app.api import register_blueprints  # noqa: E402
+from app.database import (  # noqa: E402
+    db, engine_options, pin_reads_after_write, REPLICA_BIND
+)
+from app.cache import response_cache  # noqa: E402
+from app.dedupe import contact_index  # noqa: E402
+from app.metrics import metrics  # noqa: E402
+from app.warmup import warm_up  # noqa: E402
+from urllib.parse import quote_plus  # noqa: E402
 
 load_dotenv()
 
+IMPORT_SECONDS = time.perf_counter() - _import_start
 
-def create_app():
-    app = Flask(__name__)
+
+def _env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def database_url():
+    """
+    DATABASE_URL when set (any SQLAlchemy URL, e.g. sqlite:///dev.db),
+    otherwise the MySQL URL assembled from the DB_* variables.
+    """
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
 
     # Get values from .env
     user = os.getenv("DB_USER")
@@ -25,12 +49,86 @@ def create_app():
             )
     safe_password = quote_plus(password)
 
-    # Set the Database URL
-    DATABASE_URL = (
-        f"mysql+mysqldb://{user}:{safe_password}@{host}:{port}/{dbname}"
-    )
-    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    return f"mysql+mysqldb://{user}:{safe_password}@{host}:{port}/{dbname}"
+
+
+def create_app(config=None):
+    """
+    Build the app. `config` overrides any setting, e.g.
+    create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://"}) for tests.
+    """
+    start = time.perf_counter()
+    config = config or {}
+    app = Flask(__name__)
+
+    # Set the Database URL and connection pool
+    url = config.get("SQLALCHEMY_DATABASE_URI") or database_url()
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    pool_settings = {
+        "pool_size": _env_int("DB_POOL_SIZE"),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW"),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE") or 3600,
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT"),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true") == "true",
+    }
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+        url, **pool_settings
+    )
+
+    # Optional read replica used by the GET handlers
+    replica_url = os.getenv("DATABASE_REPLICA_URL")
+    if replica_url:
+        app.config["SQLALCHEMY_BINDS"] = {
+            REPLICA_BIND: {
+                "url": replica_url,
+                **engine_options(
+                    replica_url, bind=REPLICA_BIND, **pool_settings
+                ),
+            }
+        }
+    # Seconds after a write during which the writing client's reads stay
+    # on the primary (tracked per client with a cookie)
+    app.config["REPLICA_LAG_WINDOW"] = float(
+        os.getenv("REPLICA_LAG_WINDOW", "5")
+    )
+
+    # Delta sync only hands out changes at least this many seconds old,
+    # so writes committing out of timestamp order are not skipped
+    app.config["SYNC_SETTLE_SECONDS"] = float(
+        os.getenv("SYNC_SETTLE_SECONDS", "2")
+    )
+
+    # In-process response cache for GET endpoints (0 disables it). Each
+    # worker caches on its own, so a write made through one worker can
+    # take up to the TTL to show up in the others
+    app.config["RESPONSE_CACHE_TTL"] = int(
+        os.getenv("RESPONSE_CACHE_TTL", "2")
+    )
+    app.config["RESPONSE_CACHE_MAXSIZE"] = int(
+        os.getenv("RESPONSE_CACHE_MAXSIZE", "1024")
+    )
+
+    # Request instrumentation (Server-Timing header and /metrics)
+    app.config["SLOW_QUERY_MS"] = float(os.getenv("SLOW_QUERY_MS", "500"))
+    app.config["N_PLUS_ONE_THRESHOLD"] = int(
+        os.getenv("N_PLUS_ONE_THRESHOLD", "20")
+    )
+
+    # Per-process email / phone index that rejects likely duplicate
+    # contacts before INSERT; hits are re-checked against the database
+    # unless CONTACT_DEDUPE_VERIFY is false
+    app.config["CONTACT_DEDUPE_INDEX"] = (
+        os.getenv("CONTACT_DEDUPE_INDEX", "false") == "true"
+    )
+    app.config["CONTACT_DEDUPE_VERIFY"] = (
+        os.getenv("CONTACT_DEDUPE_VERIFY", "true") == "true"
+    )
+
+    # Pooled connections each worker opens at startup (and after fork)
+    app.config["DB_WARM_CONNECTIONS"] = int(
+        os.getenv("DB_WARM_CONNECTIONS", "0")
+    )
 
     # Flask-Smorest config
     app.config["API_TITLE"] = "My First API"
@@ -41,9 +139,24 @@ def create_app():
     app.config["OPENAPI_SWAGGER_UI_URL"] = (
         "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
     )
+    app.config.update(config)
+
     db.init_app(app)
+    app.after_request(pin_reads_after_write)
+    contact_index.init_app(app)
+    response_cache.init_app(app)
+    metrics.init_app(app)
     api = Api(app)
 
     register_blueprints(api)
+    warm_up(app)
+
+    # Cold-start cost, exported at /metrics
+    startup = time.perf_counter() - start
+    metrics.set_gauge("app_import_seconds", IMPORT_SECONDS)
+    metrics.set_gauge("app_startup_seconds", startup)
+    app.logger.info(
+        "Imports took %.3f s, app startup %.3f s", IMPORT_SECONDS, startup
+    )
 
     return app
@@ -0,0 +1,162 @@
+from itertools import groupby
+from marshmallow import ValidationError
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+MAX_BULK_ITEMS = 50000
+
+UPSERT_DIALECTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _insert_statement(model, columns, upsert, conflict_key):
+    """
+    Build a plain multi-row INSERT, or an upsert that updates `columns`
+    when a unique key already exists.
+    """
+    if not upsert:
+        return db.insert(model)
+
+    dialect = db.session.get_bind().dialect.name
+    insert = UPSERT_DIALECTS.get(dialect)
+    if insert is None:
+        raise ValueError(f"Upsert is not supported on {dialect}.")
+
+    stmt = insert(model)
+    # MySQL exposes the proposed row as `inserted`, the others `excluded`
+    proposed = stmt.inserted if dialect == "mysql" else stmt.excluded
+    # Columns with an onupdate hook (updated_at) must be refreshed too
+    refreshed = [c.name for c in model.__table__.c if c.onupdate is not None]
+    changes = {
+        name: proposed[name]
+        for name in [*columns, *refreshed]
+        if name != "id"
+    }
+
+    version = model.__mapper__.version_id_col
+    if version is not None:
+        changes[version.name] = version + 1
+
+    if dialect == "mysql":
+        return stmt.on_duplicate_key_update(changes)
+
+    changes.pop(conflict_key, None)
+    return stmt.on_conflict_do_update(
+        index_elements=[conflict_key], set_=changes
+    )
+
+
+def _execute(model, rows, upsert, conflict_key):
+    # executemany needs the same keys on every row, so group by key set
+    def keys(row):
+        return tuple(sorted(row[1]))
+
+    for columns, group in groupby(sorted(rows, key=keys), key=keys):
+        stmt = _insert_statement(model, columns, upsert, conflict_key)
+        db.session.execute(stmt, [row for _, row in group])
+
+
+def _execute_isolated(model, rows, upsert, conflict_key, failures):
+    """
+    Insert `rows` inside a savepoint; when a unique key collides, split
+    the rows in halves until the offending ones are isolated, so one
+    duplicate never aborts the rest of the batch.
+    """
+    try:
+        with db.session.begin_nested():
+            _execute(model, rows, upsert, conflict_key)
+    except IntegrityError:
+        if len(rows) == 1:
+            failures.add(rows[0][0])
+            return
+
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            _execute_isolated(model, half, upsert, conflict_key, failures)
+
+
+def insert_chunk(
+    model,
+    rows,
+    upsert=False,
+    conflict_key=None,
+    precheck=None,
+    on_insert=None,
+):
+    """
+    Insert `rows`, a list of (tag, values) pairs, and commit them as one
+    transaction. Return the tags of the rows rejected as duplicates.
+
+    `precheck(rows)` may reject tags before any INSERT is sent;
+    `on_insert(values)` receives the values of the committed rows.
+    """
+    rejected = precheck(rows) if precheck else set()
+    pending = [row for row in rows if row[0] not in rejected]
+
+    failures = set()
+    if pending:
+        _execute_isolated(model, pending, upsert, conflict_key, failures)
+        db.session.commit()
+
+    if on_insert:
+        on_insert([values for tag, values in pending if tag not in failures])
+    return rejected | failures
+
+
+def bulk_create(
+    model,
+    schema,
+    items,
+    batch_size=DEFAULT_BATCH_SIZE,
+    upsert=False,
+    conflict_key=None,
+    duplicate_message="Item already exists.",
+    precheck=None,
+    on_insert=None,
+):
+    """
+    Validate `items` with `schema`, insert the valid ones in batches of
+    `batch_size` (one commit per batch) and return a per-item report.
+    `precheck` and `on_insert` are passed on to insert_chunk.
+    """
+    results = [None] * len(items)
+    rows = []
+    for index, item in enumerate(items):
+        try:
+            rows.append((index, schema.load(item)))
+        except ValidationError as err:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "errors": err.messages,
+            }
+
+    status = "upserted" if upsert else "created"
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        failures = insert_chunk(
+            model, batch, upsert, conflict_key, precheck, on_insert
+        )
+
+        for index, _ in batch:
+            if index in failures:
+                results[index] = {
+                    "index": index,
+                    "status": "error",
+                    "errors": {"_schema": [duplicate_message]},
+                }
+            else:
+                results[index] = {"index": index, "status": status}
+
+    succeeded = sum(1 for r in results if r["status"] != "error")
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
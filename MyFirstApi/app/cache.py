@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from flask import Response, request
+from werkzeug.http import http_date
+
+# Short by default: every worker process has its own cache, so after a
+# write the other workers may serve the old response (and 304s for it)
+# until their entry expires
+DEFAULT_TTL = 2
+DEFAULT_MAXSIZE = 1024
+
+CacheEntry = namedtuple("CacheEntry", ["body", "headers", "expires_at"])
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized GET responses with a TTL.
+
+    Entries are keyed by (namespace, resource id, path, query string);
+    list pages and other collection views (e.g. /todo/stats) use None as
+    resource id, so any write to the namespace drops them.
+
+    Writers call invalidate() after their commit so a cached read is
+    never older than the last write made in this process. Writes handled
+    by another worker are only seen once the entry expires, so responses
+    can be up to `ttl` seconds stale.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = DEFAULT_TTL
+        self.maxsize = DEFAULT_MAXSIZE
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.setdefault("RESPONSE_CACHE_TTL", DEFAULT_TTL)
+        self.maxsize = app.config.setdefault(
+            "RESPONSE_CACHE_MAXSIZE", DEFAULT_MAXSIZE
+        )
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key, entry, generation):
+        with self._lock:
+            # Skip the store if a write invalidated the namespace meanwhile
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace, resource_id=None, everything=False):
+        """
+        Drop every list page of `namespace` and, when given, the entry of
+        `resource_id`. `everything` also drops all single resources.
+        """
+        with self._lock:
+            self._generations[namespace] = (
+                self._generations.get(namespace, 0) + 1
+            )
+            stale = [
+                key for key in self._entries
+                if key[0] == namespace and (
+                    everything or key[1] is None or key[1] == resource_id
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def cached(self, namespace, id_arg=None):
+        """
+        Serve GET responses from the cache and answer conditional requests
+        (If-None-Match / If-Modified-Since) with 304. Responses get an
+        ETag even when caching is disabled; Last-Modified is left to the
+        handler, which knows when its rows changed.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if self.maxsize <= 0 or self.ttl <= 0:
+                    return _conditional(func(*args, **kwargs))
+
+                key = (
+                    namespace,
+                    kwargs.get(id_arg),
+                    request.path,
+                    tuple(sorted(request.args.items(multi=True))),
+                )
+                entry = self._get(key)
+                if entry is not None:
+                    response = Response(entry.body, headers=entry.headers)
+                    response.headers["X-Cache"] = "HIT"
+                    return response.make_conditional(request)
+
+                with self._lock:
+                    generation = self._generations.get(namespace, 0)
+                response = func(*args, **kwargs)
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+
+                if not response.get_etag()[0]:
+                    response.add_etag()
+                self._set(
+                    key,
+                    CacheEntry(
+                        response.get_data(),
+                        list(response.headers),
+                        time.monotonic() + self.ttl,
+                    ),
+                    generation,
+                )
+                response.headers["X-Cache"] = "MISS"
+                return response.make_conditional(request)
+
+            return wrapper
+
+        return decorator
+
+
+def _conditional(response):
+    """
+    Add an ETag to an uncached 200 response and evaluate the request's
+    conditional headers against it.
+    """
+    if response.status_code != 200 or response.is_streamed:
+        return response
+    if not response.get_etag()[0]:
+        response.add_etag()
+    return response.make_conditional(request)
+
+
+def last_modified(timestamps):
+    """
+    Last-Modified header value for the newest of `timestamps` (naive
+    values are UTC, None values are skipped); {} when there is none.
+    """
+    newest = max((t for t in timestamps if t is not None), default=None)
+    if newest is None:
+        return {}
+    return {"Last-Modified": http_date(newest)}
+
+
+response_cache = ResponseCache()
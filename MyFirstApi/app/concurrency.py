@@ -0,0 +1,54 @@
+from flask import request
+from flask_smorest import abort
+from app.database import db
+
+
+def version_etag(version):
+    """
+    Strong ETag exposing a row's version column.
+    """
+    return f'"{version}"'
+
+
+def if_match_version():
+    """
+    Return the version named by the If-Match header, or None when the
+    request is unconditional. Anything we did not issue fails with 412.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+
+    tags = if_match.as_set()
+    if len(tags) != 1 or not next(iter(tags)).isdigit():
+        abort(412, message="If-Match must carry the ETag of the resource.")
+
+    return int(next(iter(tags)))
+
+
+def patch_by_id(model, obj_id, changes, expected_version=None):
+    """
+    Apply `changes` with a single UPDATE ... WHERE id AND version and
+    bump the version. Return the new version when it is known.
+
+    A missing row is detected from the rowcount; only when a conditional
+    update fails is the row probed to tell 404 from 412 apart.
+    """
+    stmt = (
+        db.update(model)
+        .where(model.id == obj_id)
+        .values(**changes, version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(model.version == expected_version)
+
+    result = db.session.execute(stmt)
+    db.session.commit()
+
+    if result.rowcount == 1:
+        return None if expected_version is None else expected_version + 1
+
+    if expected_version is not None and db.session.get(model, obj_id):
+        abort(412, message="The resource was modified by another request.")
+    abort(404)
@@ -1,3 +1,142 @@
+import math
+import time
+from flask import current_app, g, has_request_context, request
+from flask_smorest import abort
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+from app.metrics import metrics
 
 db = SQLAlchemy()
+
+# DATETIME(6) on MySQL / MariaDB, whose plain DATETIME keeps whole
+# seconds: (timestamp, id) sync cursors need distinct change times
+PreciseDateTime = db.DateTime().with_variant(
+    mysql.DATETIME(fsp=6), "mysql", "mariadb"
+)
+
+REPLICA_BIND = "replica"
+
+# Wall-clock time until which the client that wrote reads the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that reports how long each checkout waited for a connection.
+    """
+    bind = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(
+                "db_pool_checkout_wait_seconds",
+                time.perf_counter() - start,
+                bind=self.bind,
+            )
+
+
+def engine_options(url, bind="primary", pool_size=None, max_overflow=None,
+                   pool_recycle=None, pool_pre_ping=True, pool_timeout=None):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for `url`. Pool sizing only applies to
+    server databases; SQLite keeps SQLAlchemy's default pool.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": type(
+            f"{bind.title()}TimedQueuePool", (TimedQueuePool,), {"bind": bind}
+        ),
+        "pool_pre_ping": pool_pre_ping,
+    }
+    for key, value in (
+        ("pool_size", pool_size),
+        ("max_overflow", max_overflow),
+        ("pool_recycle", pool_recycle),
+        ("pool_timeout", pool_timeout),
+    ):
+        if value is not None:
+            options[key] = value
+    return options
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_commit(session):
+    if has_request_context():
+        g.read_primary_until = (
+            time.time() + current_app.config.get("REPLICA_LAG_WINDOW", 0)
+        )
+
+
+def _pinned_to_primary():
+    if g.get("read_primary_until") is not None:
+        return True
+    try:
+        until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() < until
+
+
+def read_bind():
+    """
+    Engine that read-only handlers should use: the replica when one is
+    configured, except for a client that wrote within the last
+    REPLICA_LAG_WINDOW seconds, which keeps reading the primary (through
+    the cookie set by pin_reads_after_write) while the replica catches
+    up. Other clients' reads are unaffected by its writes.
+    """
+    replica = db.engines.get(REPLICA_BIND)
+    if replica is None:
+        return None
+
+    if has_request_context() and _pinned_to_primary():
+        return None
+    return replica
+
+
+def pin_reads_after_write(response):
+    """
+    after_request hook: after a commit, tell the client to read from the
+    primary until the replica lag window has passed.
+    """
+    until = g.pop("read_primary_until", None)
+    if until is not None and REPLICA_BIND in db.engines:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f"{until:.3f}",
+            max_age=math.ceil(current_app.config["REPLICA_LAG_WINDOW"]),
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def execute_read(stmt, **kwargs):
+    """
+    Execute a read-only statement, routed to the replica when available.
+    """
+    bind = read_bind()
+    if bind is not None:
+        kwargs["bind_arguments"] = {"bind": bind}
+    return db.session.execute(stmt, **kwargs)
+
+
+def get_or_404_read(model, obj_id):
+    """
+    db.get_or_404 equivalent that reads through execute_read.
+    """
+    obj = execute_read(
+        db.select(model).where(model.id == obj_id)
+    ).scalar_one_or_none()
+    if obj is None:
+        abort(404)
+    return obj
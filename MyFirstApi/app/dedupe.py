@@ -0,0 +1,152 @@
+import logging
+import re
+import threading
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import db
+from app.metrics import metrics
+from app.models import ContactModel
+
+logger = logging.getLogger(__name__)
+
+WARM_BATCH_SIZE = 5000
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def normalize_phone(phone):
+    return re.sub(r"\D", "", phone)
+
+
+class ContactIndex:
+    """
+    Optional per-process membership index of contact emails and phones.
+
+    It lets likely duplicates be rejected before an INSERT is attempted.
+    The database unique constraints stay the final authority: a miss
+    here still goes to the database. A hit is confirmed with an indexed
+    lookup when CONTACT_DEDUPE_VERIFY is on, because other processes can
+    delete or change contacts without this index seeing it.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.verify = True
+        self._emails = set()
+        self._phones = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.setdefault("CONTACT_DEDUPE_INDEX", False)
+        self.verify = app.config.setdefault("CONTACT_DEDUPE_VERIFY", True)
+        self.clear()
+        if self.enabled:
+            with app.app_context():
+                self.warm()
+
+    def clear(self):
+        with self._lock:
+            self._emails.clear()
+            self._phones.clear()
+
+    def warm(self):
+        """
+        Load every email / phone from the contacts table.
+        """
+        stmt = db.select(ContactModel.email, ContactModel.phone)
+        try:
+            result = db.session.execute(
+                stmt.execution_options(yield_per=WARM_BATCH_SIZE)
+            )
+            for email, phone in result:
+                self.add(email, phone)
+        except SQLAlchemyError:
+            # An empty index only costs extra INSERT attempts
+            db.session.rollback()
+            logger.exception("Could not warm the contact dedupe index")
+        finally:
+            db.session.remove()
+
+        logger.info(
+            "Contact dedupe index holds %d emails", len(self._emails)
+        )
+
+    def add(self, email, phone):
+        self.add_many([{"email": email, "phone": phone}])
+
+    def add_many(self, contacts):
+        """
+        Record the email / phone of newly committed contacts.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for contact in contacts:
+                # Partial updates may only carry one of the two
+                if contact.get("email"):
+                    self._emails.add(normalize_email(contact["email"]))
+                if contact.get("phone"):
+                    self._phones.add(normalize_phone(contact["phone"]))
+
+    def discard(self, email, phone):
+        if not self.enabled:
+            return
+        with self._lock:
+            if email:
+                self._emails.discard(normalize_email(email))
+            if phone:
+                self._phones.discard(normalize_phone(phone))
+
+    def likely_duplicate(self, email, phone):
+        """
+        True when a contact with this email or phone most likely exists.
+        """
+        rows = [(0, {"email": email, "phone": phone})]
+        return bool(self.likely_duplicates(rows))
+
+    def likely_duplicates(self, rows):
+        """
+        Return the tags of the (tag, contact) pairs that most likely exist
+        already. Hits are confirmed with a single IN query when verifying;
+        like the index, it compares normalized emails and phones.
+        """
+        if not self.enabled:
+            return set()
+
+        with self._lock:
+            hits = [
+                (tag, contact) for tag, contact in rows
+                if normalize_email(contact["email"]) in self._emails
+                or normalize_phone(contact["phone"]) in self._phones
+            ]
+        if hits and self.verify:
+            # Cheap unique-index probe instead of failed INSERTs; rows are
+            # looked up as sent and as normalized
+            emails = {c["email"] for _, c in hits}
+            phones = {c["phone"] for _, c in hits}
+            emails |= {normalize_email(email) for email in emails}
+            phones |= {normalize_phone(phone) for phone in phones}
+            found = db.session.execute(
+                db.select(ContactModel.email, ContactModel.phone).where(or_(
+                    ContactModel.email.in_(emails),
+                    ContactModel.phone.in_(phones),
+                ))
+            ).all()
+            emails = {normalize_email(email) for email, _ in found}
+            phones = {normalize_phone(phone) for _, phone in found}
+            hits = [
+                (tag, contact) for tag, contact in hits
+                if normalize_email(contact["email"]) in emails
+                or normalize_phone(contact["phone"]) in phones
+            ]
+
+        if hits:
+            metrics.increment("contact_dedupe_rejections_total", len(hits))
+        return {tag for tag, _ in hits}
+
+
+contact_index = ContactIndex()
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_N_PLUS_ONE_THRESHOLD = 20
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Per-request SQL / serialization timing and process-wide histograms.
+
+    Every request gets a Server-Timing header with its query count, DB
+    time and serialization time; aggregated histograms are served in the
+    Prometheus text format at /metrics.
+    """
+
+    def __init__(self, app=None):
+        self.slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        self.n_plus_one_threshold = DEFAULT_N_PLUS_ONE_THRESHOLD
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.slow_query_ms = app.config.setdefault(
+            "SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS
+        )
+        self.n_plus_one_threshold = app.config.setdefault(
+            "N_PLUS_ONE_THRESHOLD", DEFAULT_N_PLUS_ONE_THRESHOLD
+        )
+
+        # Engine-class listeners see every engine, including binds
+        if not event.contains(
+            Engine, "before_cursor_execute", self._before_cursor_execute
+        ):
+            event.listen(
+                Engine, "before_cursor_execute", self._before_cursor_execute
+            )
+            event.listen(
+                Engine, "after_cursor_execute", self._after_cursor_execute
+            )
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule("/metrics", "metrics", self.export)
+
+    # Recording
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Add the elapsed time of the block to the request's `name` timing.
+        Nested timers of the same name only count the outermost block.
+        """
+        if not has_request_context() or name in g.active_timers:
+            yield
+            return
+
+        g.active_timers.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            g.active_timers.discard(name)
+            g.timings[name] = (
+                g.timings.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    # SQLAlchemy hooks
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+        if elapsed * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms): %s", elapsed * 1000, statement
+            )
+
+        if has_request_context() and "timings" in g:
+            g.query_count += 1
+            g.timings["db"] = g.timings.get("db", 0.0) + elapsed
+
+    # Flask hooks
+
+    def _start_request(self):
+        g.request_start = time.perf_counter()
+        g.query_count = 0
+        g.timings = {}
+        g.active_timers = set()
+
+    def _finish_request(self, response):
+        if "request_start" not in g:
+            return response
+
+        elapsed = time.perf_counter() - g.request_start
+        endpoint = request.endpoint or "unmatched"
+
+        if g.query_count > self.n_plus_one_threshold:
+            logger.warning(
+                "Possible N+1: %s %s issued %d SQL statements",
+                request.method, request.path, g.query_count
+            )
+
+        self.observe(
+            "http_request_duration_seconds",
+            elapsed,
+            endpoint=endpoint,
+            method=request.method,
+        )
+        self.increment(
+            "db_queries_total",
+            g.query_count,
+            endpoint=endpoint,
+            method=request.method,
+        )
+
+        timing = [
+            f'db;dur={g.timings.get("db", 0.0) * 1000:.2f};'
+            f'desc="{g.query_count} queries"'
+        ]
+        if "serialize" in g.timings:
+            timing.append(f'ser;dur={g.timings["serialize"] * 1000:.2f}')
+        timing.append(f"total;dur={elapsed * 1000:.2f}")
+        response.headers.add("Server-Timing", ", ".join(timing))
+
+        return response
+
+    # Export
+
+    def export(self):
+        """
+        Prometheus text exposition of all histograms, counters and gauges.
+        """
+        def fmt(labels, **extra):
+            pairs = [*labels, *extra.items()]
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(f"{name}{fmt(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                lines.append(f"{name}{fmt(labels)} {value}")
+            for (name, labels), histogram in sorted(
+                self._histograms.items(), key=lambda item: item[0]
+            ):
+                cumulative = 0
+                for bound, count in zip(
+                    [*BUCKETS, "+Inf"], histogram.counts
+                ):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{fmt(labels, le=bound)} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{fmt(labels)} {histogram.total}")
+                lines.append(f"{name}_count{fmt(labels)} {histogram.count}")
+
+        return Response("\n".join(lines) + "\n", mimetype="text/plain")
+
+
+metrics = Metrics()
@@ -1,5 +1,6 @@
 from app.models.contact import ContactModel
 from app.models.todo import TodoModel
+from app.models.contact_deletion import ContactDeletionModel
 
 # This makes it easy to import all models at once if needed
-__all__ = ["ContactModel", "TodoModel"]
+__all__ = ["ContactModel", "TodoModel", "ContactDeletionModel"]
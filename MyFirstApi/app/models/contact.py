@@ -1,9 +1,16 @@
-from app.database import db
+from app.database import db, PreciseDateTime
 from datetime import datetime, timezone
 
 
 class ContactModel(db.Model):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Back the equality / prefix filters of GET /contact
+        db.Index("ix_contacts_country_state_city", "country", "state", "city"),
+        db.Index("ix_contacts_state_name", "state", "name"),
+        db.Index("ix_contacts_city_name", "city", "name"),
+        db.Index("ix_contacts_name", "name"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(30), nullable=False)
@@ -16,7 +23,14 @@ class ContactModel(db.Model):
     country = db.Column(db.String(30), nullable=False, default="Unknown")
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(
-        db.DateTime,
+        PreciseDateTime,
+        index=True,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
+    version = db.Column(
+        db.Integer, nullable=False, default=1, server_default="1"
+    )
+
+    # Optimistic concurrency: ORM updates bump and check the version
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,15 @@
+from app.database import db, PreciseDateTime
+from datetime import datetime, timezone
+
+
+class ContactDeletionModel(db.Model):
+    __tablename__ = "contact_deletions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    contact_id = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(
+        PreciseDateTime,
+        nullable=False,
+        index=True,
+        default=lambda: datetime.now(timezone.utc)
+    )
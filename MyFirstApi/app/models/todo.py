@@ -8,7 +8,13 @@ class TodoModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(30), unique=True, nullable=False)
     task = db.Column(db.String(255), unique=True, nullable=False)
-    done = db.Column(db.Boolean, default=False)
+    done = db.Column(db.Boolean, default=False, index=True)
     created_at = db.Column(
             db.DateTime, default=lambda: datetime.now(timezone.utc)
         )
+    version = db.Column(
+        db.Integer, nullable=False, default=1, server_default="1"
+    )
+
+    # Optimistic concurrency: ORM updates bump and check the version
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,157 @@
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import tuple_
+from app.database import db, execute_read
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+
+def _seek_select(model, after=None, filters=(), sort="id", columns=None):
+    """
+    SELECT `model` rows matching `filters`, ordered by `sort` ("name" or
+    "-name" style, always tie-broken by id) and positioned after the row
+    whose id is `after`. With `columns`, only those columns (plus id) are
+    selected and plain rows are returned instead of ORM objects.
+    """
+    descending = sort.startswith("-")
+    column = getattr(model, sort.lstrip("-"))
+    keys = [model.id] if column is model.id else [column, model.id]
+
+    if columns is None:
+        entities = [model]
+    else:
+        names = dict.fromkeys(["id", *columns])
+        entities = [getattr(model, name) for name in names]
+
+    stmt = db.select(*entities).where(*filters)
+    if after is not None:
+        if len(keys) == 1:
+            anchor = [after]
+        else:
+            # Seek from the sort key of the last row the client has seen
+            value = execute_read(
+                db.select(column).where(model.id == after)
+            ).scalar_one_or_none()
+            if value is None:
+                raise ValueError("The row given in after no longer exists.")
+            anchor = [value, after]
+
+        position, anchor = tuple_(*keys), tuple_(*anchor)
+        stmt = stmt.where(
+            position < anchor if descending else position > anchor
+        )
+
+    return stmt.order_by(*(k.desc() if descending else k for k in keys))
+
+
+def _rows(result, columns):
+    return result.scalars() if columns is None else result
+
+
+def keyset_page(
+    model, limit, after=None, filters=(), sort="id", columns=None
+):
+    """
+    Return one page of rows starting after the `after` id, together with
+    the cursor of the next page (None on the last page).
+    """
+    stmt = _seek_select(model, after, filters, sort, columns)
+    # Fetch one extra row to know whether another page exists
+    stmt = stmt.limit(limit + 1)
+
+    rows = _rows(execute_read(stmt), columns).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+
+    return rows[:limit], next_cursor
+
+
+def page_headers(next_cursor, limit):
+    """
+    Build the Link / X-Next-Cursor headers pointing at the next page.
+    """
+    if next_cursor is None:
+        return {}
+
+    args = request.args.to_dict()
+    args.update(after=next_cursor, limit=limit)
+    next_url = f"{request.base_url}?{urlencode(args)}"
+
+    return {
+        "Link": f'<{next_url}>; rel="next"',
+        "X-Next-Cursor": str(next_cursor),
+    }
+
+
+def iter_rows(
+    model,
+    serializer,
+    after=None,
+    filters=(),
+    sort="id",
+    batch_size=STREAM_BATCH_SIZE,
+):
+    """
+    Iterate over every matching row, serialized, as it is read from a
+    server-side cursor instead of loading the whole table.
+
+    The `after` row is looked up on call, not on first iteration, so a
+    ValueError for a missing anchor is raised before a streamed response
+    has started.
+    """
+    columns = serializer.names
+    stmt = _seek_select(
+        model, after, filters, sort, columns
+    ).execution_options(yield_per=batch_size)
+
+    def generate():
+        for row in _rows(execute_read(stmt), columns):
+            yield serializer.dump(row)
+
+    return generate()
+
+
+def stream_json(model, serializer, **kwargs):
+    """
+    Stream the rows of iter_rows as a single JSON array.
+    """
+    rows = iter_rows(model, serializer, **kwargs)
+
+    def generate():
+        dumps = current_app.json.dumps
+        yield "["
+        separator = ""
+        for row in rows:
+            yield separator + dumps(row)
+            separator = ","
+        yield "]"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/json"
+    )
+
+
+def encode_cursor(timestamp, kind, row_id):
+    """
+    Encode a (timestamp, kind, id) keyset position as an opaque token.
+    """
+    raw = json.dumps([timestamp.isoformat(), kind, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by encode_cursor; raises ValueError if the
+    token was not issued by this API.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode())
+        timestamp, kind, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(kind), int(row_id)
+    except (TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor.") from err
@@ -1,9 +1,39 @@
+import re
+from flask import jsonify, request
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from app.models import ContactModel
-from app.schemas import ContactSchema
-from app.database import db
+from app.models import ContactModel, ContactDeletionModel
+from app.schemas import (
+    ContactSchema,
+    ContactPatchSchema,
+    ContactListArgsSchema,
+    BulkArgsSchema,
+    BulkQueryArgsSchema,
+    BulkResultSchema,
+    ContactChangesArgsSchema,
+    ContactChangesSchema,
+    ExportArgsSchema,
+    ImportArgsSchema,
+    ImportResultSchema,
+)
+from app.pagination import (
+    keyset_page,
+    page_headers,
+    stream_json,
+    iter_rows,
+    encode_cursor,
+    decode_cursor,
+)
+from app.serializers import contact_serializer
+from app.transfer import export_response, import_stream
+from app.sync import contact_changes, to_utc_naive, UPSERT
+from app.bulk import bulk_create
+from app.database import db, get_or_404_read
+from app.cache import response_cache, last_modified
+from app.dedupe import contact_index
+from app.concurrency import if_match_version, patch_by_id, version_etag
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 bp = Blueprint(
     "Contacts",
@@ -11,55 +41,291 @@ bp = Blueprint(
     description="Operations on contacts"
 )
 
+# Built once at import instead of per request
+contact_schema = ContactSchema()
+
+DUPLICATE_CONTACT = "A contact with that email or phone already exists."
+
 
 @bp.route("/contact")
 class ContactList(MethodView):
+    @response_cache.cached("contacts")
+    @bp.arguments(ContactListArgsSchema, location="query")
     @bp.response(200, ContactSchema(many=True))
-    def get(self):
-        return ContactModel.query.all()
+    def get(self, list_args):
+        filters = [
+            getattr(ContactModel, key) == list_args[key]
+            for key in ("city", "state", "country")
+            if key in list_args
+        ]
+        if "name" in list_args:
+            # Prefix LIKE 'abc%' bound as one literal (startswith() would
+            # send 'abc' || '%') so the name index can be range-scanned
+            prefix = re.sub(r"([/%_])", r"/\1", list_args["name"])
+            filters.append(ContactModel.name.like(prefix + "%", escape="/"))
+
+        try:
+            # Read-only fast path: project the SELECT to the requested
+            # fields and dump them without going through marshmallow
+            serializer = contact_serializer.compile(list_args.get("only"))
+            if list_args["stream"]:
+                return stream_json(
+                    ContactModel,
+                    serializer,
+                    after=list_args.get("after"),
+                    filters=filters,
+                    sort=list_args["sort"],
+                )
+
+            contacts, next_cursor = keyset_page(
+                ContactModel,
+                list_args["limit"],
+                list_args.get("after"),
+                filters=filters,
+                sort=list_args["sort"],
+                # updated_at is read for Last-Modified even when the
+                # projection leaves it out of the body
+                columns=(*serializer.names, "updated_at"),
+            )
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        return (
+            jsonify(serializer.dump_many(contacts)),
+            {
+                **page_headers(next_cursor, list_args["limit"]),
+                **last_modified(c.updated_at for c in contacts),
+            },
+        )
 
     @bp.arguments(ContactSchema)
     @bp.response(201, ContactSchema)
     def post(self, new_contact):
+        if contact_index.likely_duplicate(
+            new_contact["email"], new_contact["phone"]
+        ):
+            abort(400, message=DUPLICATE_CONTACT)
+
         contact = ContactModel(**new_contact)
         try:
             db.session.add(contact)
             db.session.commit()
+            response_cache.invalidate("contacts")
         except IntegrityError:
-            abort(
-                400,
-                message="A contact with that email or phone already exists."
-            )
+            db.session.rollback()
+            abort(400, message=DUPLICATE_CONTACT)
         except SQLAlchemyError:
+            db.session.rollback()
             abort(
                 500,
                 message="An error occurred while creating the contact."
             )
+        contact_index.add(new_contact["email"], new_contact["phone"])
         return contact
 
 
+@bp.route("/contact/bulk")
+class ContactBulk(MethodView):
+    @bp.arguments(BulkQueryArgsSchema, location="query")
+    @bp.arguments(BulkArgsSchema)
+    @bp.response(200, BulkResultSchema)
+    def post(self, bulk_query, bulk_args):
+        try:
+            return bulk_create(
+                ContactModel,
+                contact_schema,
+                bulk_args["items"],
+                batch_size=bulk_query["batch_size"],
+                upsert=bulk_query["upsert"],
+                conflict_key="email",
+                duplicate_message=DUPLICATE_CONTACT,
+                # An upsert is expected to hit existing contacts
+                precheck=(
+                    None if bulk_query["upsert"]
+                    else contact_index.likely_duplicates
+                ),
+                on_insert=contact_index.add_many,
+            )
+        except ValueError as err:
+            abort(400, message=str(err))
+        except SQLAlchemyError:
+            db.session.rollback()
+            abort(
+                500,
+                message="An error occurred while importing the contacts."
+            )
+        finally:
+            # Earlier batches stay committed even if a later one fails
+            response_cache.invalidate("contacts", everything=True)
+
+
+@bp.route("/contact/export")
+class ContactExport(MethodView):
+    @bp.arguments(ExportArgsSchema, location="query")
+    @bp.response(200)
+    def get(self, export_args):
+        """
+        Stream all contacts as CSV or NDJSON.
+        """
+        try:
+            serializer = contact_serializer.compile(export_args.get("only"))
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        return export_response(
+            iter_rows(ContactModel, serializer),
+            serializer.names,
+            export_args["format"],
+            "contacts",
+        )
+
+
+@bp.route("/contact/import")
+class ContactImport(MethodView):
+    @bp.arguments(ImportArgsSchema, location="query")
+    @bp.response(200, ImportResultSchema)
+    def post(self, import_args):
+        """
+        Import contacts from a CSV or NDJSON request body, read as a
+        stream and committed in chunks.
+        """
+        try:
+            return import_stream(
+                ContactModel,
+                contact_schema,
+                request.stream,
+                import_args["format"],
+                chunk_size=import_args["chunk_size"],
+                upsert=import_args["upsert"],
+                conflict_key="email",
+                duplicate_message=DUPLICATE_CONTACT,
+                precheck=(
+                    None if import_args["upsert"]
+                    else contact_index.likely_duplicates
+                ),
+                on_insert=contact_index.add_many,
+            )
+        except ValueError as err:
+            abort(400, message=str(err))
+        except SQLAlchemyError:
+            db.session.rollback()
+            abort(
+                500,
+                message="An error occurred while importing the contacts."
+            )
+        finally:
+            # Earlier chunks stay committed even if a later one fails
+            response_cache.invalidate("contacts", everything=True)
+
+
+@bp.route("/contact/changes")
+class ContactChanges(MethodView):
+    @bp.arguments(ContactChangesArgsSchema, location="query")
+    @bp.response(200, ContactChangesSchema)
+    def get(self, changes_args):
+        """
+        Contacts changed or deleted since a timestamp or a previous cursor.
+        """
+        if "cursor" in changes_args:
+            try:
+                position = decode_cursor(changes_args["cursor"])
+            except ValueError as err:
+                abort(400, message=str(err))
+        else:
+            position = (to_utc_naive(changes_args["since"]), UPSERT, 0)
+
+        changes, position, has_more = contact_changes(
+            position, changes_args["limit"]
+        )
+        return {
+            "changes": changes,
+            "next_cursor": encode_cursor(*position),
+            "has_more": has_more,
+        }
+
+
 @bp.route("/contact/<int:contact_id>")
 class ContactResource(MethodView):
+    @response_cache.cached("contacts", id_arg="contact_id")
     @bp.response(200, ContactSchema)
     def get(self, contact_id):
-        return ContactModel.query.get_or_404(contact_id)
+        contact = get_or_404_read(ContactModel, contact_id)
+        return contact, {
+            "ETag": version_etag(contact.version),
+            **last_modified([contact.updated_at]),
+        }
 
     @bp.arguments(ContactSchema)
     @bp.response(200, ContactSchema)
     def put(self, update_contact, contact_id):
         contact = ContactModel.query.get_or_404(contact_id)
+        previous = (contact.email, contact.phone)
         for key, value in update_contact.items():
             setattr(contact, key, value)
 
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            abort(412, message="The resource was modified by another request.")
+        except IntegrityError:
+            db.session.rollback()
+            abort(400, message=DUPLICATE_CONTACT)
+        response_cache.invalidate("contacts", contact_id)
+        contact_index.discard(*previous)
+        contact_index.add(update_contact["email"], update_contact["phone"])
+
+        return contact, {"ETag": version_etag(contact.version)}
 
-        return contact
+    @bp.arguments(ContactPatchSchema)
+    @bp.response(204)
+    def patch(self, changes, contact_id):
+        """
+        Partial update in a single UPDATE statement. Send the ETag from a
+        previous GET as If-Match to fail with 412 instead of overwriting a
+        concurrent change.
+        """
+        previous = None
+        if contact_index.enabled and changes.keys() & {"email", "phone"}:
+            # One primary-key read so replaced values leave the index
+            previous = db.session.execute(
+                db.select(ContactModel.email, ContactModel.phone)
+                .where(ContactModel.id == contact_id)
+            ).one_or_none()
+
+        try:
+            version = patch_by_id(
+                ContactModel, contact_id, changes, if_match_version()
+            )
+        except IntegrityError:
+            db.session.rollback()
+            abort(400, message=DUPLICATE_CONTACT)
+        response_cache.invalidate("contacts", contact_id)
+        if previous is not None:
+            contact_index.discard(
+                previous.email if "email" in changes else None,
+                previous.phone if "phone" in changes else None,
+            )
+        contact_index.add(changes.get("email"), changes.get("phone"))
+
+        if version is None:
+            return None
+        return None, {"ETag": version_etag(version)}
 
     @bp.response(204)
     def delete(self, contact_id):
         contact = ContactModel.query.get_or_404(contact_id)
+        email, phone = contact.email, contact.phone
 
+        # Tombstone for /contact/changes, written in the same transaction
+        db.session.add(ContactDeletionModel(contact_id=contact.id))
         db.session.delete(contact)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            abort(412, message="The resource was modified by another request.")
+        response_cache.invalidate("contacts", contact_id)
+        contact_index.discard(email, phone)
 
         return None
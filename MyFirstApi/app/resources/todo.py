@@ -1,9 +1,26 @@
+from flask import jsonify
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from app.models import TodoModel
-from app.schemas import TodoSchema
-from app.database import db
+from app.schemas import (
+    TodoSchema,
+    TodoPatchSchema,
+    PageArgsSchema,
+    BulkArgsSchema,
+    BulkQueryArgsSchema,
+    BulkResultSchema,
+    TodoBulkUpdateSchema,
+    TodoBulkUpdateResultSchema,
+    TodoStatsSchema,
+)
+from app.pagination import keyset_page, page_headers, stream_json
+from app.bulk import bulk_create
+from app.serializers import todo_serializer
+from app.database import db, get_or_404_read, execute_read
+from app.cache import response_cache
+from app.concurrency import if_match_version, patch_by_id, version_etag
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 
 bp = Blueprint(
@@ -12,12 +29,36 @@ bp = Blueprint(
     description="Operations on todos"
 )
 
+# Built once at import instead of per request
+todo_schema = TodoSchema()
+
 
 @bp.route("/todo")
 class TodoList(MethodView):
+    @response_cache.cached("todos")
+    @bp.arguments(PageArgsSchema, location="query")
     @bp.response(200, TodoSchema(many=True))
-    def get(self):
-        return TodoModel.query.all()
+    def get(self, page_args):
+        try:
+            serializer = todo_serializer.compile(page_args.get("only"))
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        if page_args["stream"]:
+            return stream_json(
+                TodoModel, serializer, after=page_args.get("after")
+            )
+
+        todos, next_cursor = keyset_page(
+            TodoModel,
+            page_args["limit"],
+            page_args.get("after"),
+            columns=serializer.names,
+        )
+        return (
+            jsonify(serializer.dump_many(todos)),
+            page_headers(next_cursor, page_args["limit"]),
+        )
 
     @bp.arguments(TodoSchema)
     @bp.response(201, TodoSchema)
@@ -26,12 +67,15 @@ class TodoList(MethodView):
         try:
             db.session.add(todo)
             db.session.commit()
+            response_cache.invalidate("todos")
         except IntegrityError:
+            db.session.rollback()
             abort(
                 400,
                 message="A todo with same title or skill already exists."
             )
         except SQLAlchemyError:
+            db.session.rollback()
             abort(
                 500,
                 message="An error occurred while creating the contact."
@@ -40,11 +84,105 @@ class TodoList(MethodView):
         return todo
 
 
+@bp.route("/todo/bulk")
+class TodoBulk(MethodView):
+    @bp.arguments(BulkQueryArgsSchema, location="query")
+    @bp.arguments(BulkArgsSchema)
+    @bp.response(200, BulkResultSchema)
+    def post(self, bulk_query, bulk_args):
+        try:
+            return bulk_create(
+                TodoModel,
+                todo_schema,
+                bulk_args["items"],
+                batch_size=bulk_query["batch_size"],
+                upsert=bulk_query["upsert"],
+                conflict_key="title",
+                duplicate_message=(
+                    "A todo with same title or skill already exists."
+                )
+            )
+        except ValueError as err:
+            abort(400, message=str(err))
+        except SQLAlchemyError:
+            db.session.rollback()
+            abort(
+                500,
+                message="An error occurred while importing the todos."
+            )
+        finally:
+            # Earlier batches stay committed even if a later one fails
+            response_cache.invalidate("todos", everything=True)
+
+    @bp.arguments(TodoBulkUpdateSchema)
+    @bp.response(200, TodoBulkUpdateResultSchema)
+    def patch(self, update_args):
+        """
+        Set done or delete many todos, selected by ids or by a filter,
+        with a single UPDATE / DELETE statement.
+        """
+        if "ids" in update_args:
+            conditions = [TodoModel.id.in_(update_args["ids"])]
+        else:
+            todo_filter = update_args["filter"]
+            conditions = []
+            if "done" in todo_filter:
+                conditions.append(TodoModel.done == todo_filter["done"])
+            if "title" in todo_filter:
+                conditions.append(TodoModel.title.startswith(
+                    todo_filter["title"], autoescape=True
+                ))
+
+        if update_args["delete"]:
+            stmt = db.delete(TodoModel).where(*conditions)
+        else:
+            stmt = (
+                db.update(TodoModel)
+                .where(*conditions)
+                .values(
+                    done=update_args["done"],
+                    version=TodoModel.version + 1
+                )
+            )
+
+        try:
+            result = db.session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            )
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            abort(500, message="An error occurred while updating the todos.")
+        response_cache.invalidate("todos", everything=True)
+
+        return {"affected": result.rowcount}
+
+
+@bp.route("/todo/stats")
+class TodoStats(MethodView):
+    @response_cache.cached("todos")
+    @bp.response(200, TodoStatsSchema)
+    def get(self):
+        """
+        Total / done / pending counts from one GROUP BY over the done index.
+        """
+        counts = execute_read(
+            db.select(TodoModel.done, db.func.count())
+            .group_by(TodoModel.done)
+        ).all()
+
+        done = sum(count for is_done, count in counts if is_done)
+        total = sum(count for _, count in counts)
+        return {"total": total, "done": done, "pending": total - done}
+
+
 @bp.route("/todo/<int:todo_id>")
 class TodoResource(MethodView):
+    @response_cache.cached("todos", id_arg="todo_id")
     @bp.response(200, TodoSchema)
     def get(self, todo_id):
-        return TodoModel.query.get_or_404(todo_id)
+        todo = get_or_404_read(TodoModel, todo_id)
+        return todo, {"ETag": version_etag(todo.version)}
 
     @bp.arguments(TodoSchema)
     @bp.response(200, TodoSchema)
@@ -53,15 +191,49 @@ class TodoResource(MethodView):
         for key, value in data_toUpdate.items():
             setattr(todo, key, value)
 
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            abort(412, message="The resource was modified by another request.")
+        response_cache.invalidate("todos", todo_id)
 
-        return todo
+        return todo, {"ETag": version_etag(todo.version)}
+
+    @bp.arguments(TodoPatchSchema)
+    @bp.response(204)
+    def patch(self, changes, todo_id):
+        """
+        Partial update in a single UPDATE statement. Send the ETag from a
+        previous GET as If-Match to fail with 412 instead of overwriting a
+        concurrent change.
+        """
+        try:
+            version = patch_by_id(
+                TodoModel, todo_id, changes, if_match_version()
+            )
+        except IntegrityError:
+            db.session.rollback()
+            abort(
+                400,
+                message="A todo with same title or skill already exists."
+            )
+        response_cache.invalidate("todos", todo_id)
+
+        if version is None:
+            return None
+        return None, {"ETag": version_etag(version)}
 
     @bp.response(204)
     def delete(self, todo_id):
         todo = TodoModel.query.get_or_404(todo_id)
 
         db.session.delete(todo)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            abort(412, message="The resource was modified by another request.")
+        response_cache.invalidate("todos", todo_id)
 
         return None
@@ -1,5 +1,45 @@
-from app.schemas.contact import ContactSchema
-from app.schemas.todo import TodoSchema
+from app.schemas.contact import (
+    ContactSchema,
+    ContactPatchSchema,
+    ContactListArgsSchema,
+)
+from app.schemas.todo import (
+    TodoSchema,
+    TodoPatchSchema,
+    TodoBulkUpdateSchema,
+    TodoBulkUpdateResultSchema,
+    TodoStatsSchema,
+)
+from app.schemas.pagination import PageArgsSchema
+from app.schemas.bulk import (
+    BulkArgsSchema,
+    BulkQueryArgsSchema,
+    BulkResultSchema,
+)
+from app.schemas.sync import ContactChangesArgsSchema, ContactChangesSchema
+from app.schemas.transfer import (
+    ExportArgsSchema,
+    ImportArgsSchema,
+    ImportResultSchema,
+)
 
 # This makes it easy to import all models at once if needed
-__all__ = ["ContactSchema", "TodoSchema"]
+__all__ = [
+    "ContactSchema",
+    "ContactPatchSchema",
+    "ContactListArgsSchema",
+    "TodoSchema",
+    "TodoPatchSchema",
+    "TodoBulkUpdateSchema",
+    "TodoBulkUpdateResultSchema",
+    "TodoStatsSchema",
+    "PageArgsSchema",
+    "BulkArgsSchema",
+    "BulkQueryArgsSchema",
+    "BulkResultSchema",
+    "ContactChangesArgsSchema",
+    "ContactChangesSchema",
+    "ExportArgsSchema",
+    "ImportArgsSchema",
+    "ImportResultSchema",
+]
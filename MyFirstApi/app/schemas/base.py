@@ -0,0 +1,12 @@
+from marshmallow import Schema
+from app.metrics import metrics
+
+
+class TimedSchema(Schema):
+    """
+    Schema whose dumps count towards the request's serialization time.
+    """
+
+    def dump(self, obj, *, many=None):
+        with metrics.timer("serialize"):
+            return super().dump(obj, many=many)
@@ -0,0 +1,31 @@
+from marshmallow import Schema, fields, validate
+from app.schemas.base import TimedSchema
+from app.bulk import DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE, MAX_BULK_ITEMS
+
+
+class BulkArgsSchema(Schema):
+    items = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_BULK_ITEMS)
+    )
+
+
+class BulkQueryArgsSchema(Schema):
+    upsert = fields.Bool(load_default=False)
+    batch_size = fields.Int(
+        load_default=DEFAULT_BATCH_SIZE,
+        validate=validate.Range(min=1, max=MAX_BATCH_SIZE)
+    )
+
+
+class BulkItemResultSchema(Schema):
+    index = fields.Int()
+    status = fields.Str()
+    errors = fields.Dict()
+
+
+class BulkResultSchema(TimedSchema):
+    succeeded = fields.Int()
+    failed = fields.Int()
+    results = fields.List(fields.Nested(BulkItemResultSchema))
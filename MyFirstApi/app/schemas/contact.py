@@ -1,7 +1,9 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import fields, validate
+from app.schemas.base import TimedSchema
+from app.schemas.pagination import PageArgsSchema
 
 
-class ContactSchema(Schema):
+class ContactSchema(TimedSchema):
     id = fields.Int(dump_only=True)
     name = fields.Str(required=True, validate=validate.Length(min=1, max=30))
     email = fields.Email(required=True, validate=validate.Email())
@@ -13,3 +15,28 @@ class ContactSchema(Schema):
     country = fields.Str(required=False)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
+    version = fields.Int(dump_only=True)
+
+
+class ContactPatchSchema(ContactSchema):
+    """
+    ContactSchema with every field optional, for PATCH requests.
+    """
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("partial", True)
+        super().__init__(*args, **kwargs)
+
+
+class ContactListArgsSchema(PageArgsSchema):
+    city = fields.Str(required=False)
+    state = fields.Str(required=False)
+    country = fields.Str(required=False)
+    name = fields.Str(
+        required=False,
+        validate=validate.Length(min=1, max=30),
+        metadata={"description": "Name prefix"}
+    )
+    sort = fields.Str(
+        load_default="id",
+        validate=validate.OneOf(["id", "-id", "name", "-name"])
+    )
@@ -0,0 +1,18 @@
+from marshmallow import Schema, fields, validate
+from webargs.fields import DelimitedList
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class PageArgsSchema(Schema):
+    limit = fields.Int(
+        load_default=DEFAULT_PAGE_SIZE,
+        validate=validate.Range(min=1, max=MAX_PAGE_SIZE)
+    )
+    after = fields.Int(required=False, validate=validate.Range(min=0))
+    stream = fields.Bool(load_default=False)
+    only = DelimitedList(
+        fields.Str(),
+        required=False,
+        data_key="fields",
+        metadata={"description": "Comma separated fields to return"}
+    )
@@ -0,0 +1,32 @@
+from marshmallow import Schema, ValidationError, fields, validate
+from marshmallow import validates_schema
+from app.schemas.base import TimedSchema
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.contact import ContactSchema
+
+
+class ContactChangesArgsSchema(Schema):
+    since = fields.DateTime(required=False)
+    cursor = fields.Str(required=False)
+    limit = fields.Int(
+        load_default=DEFAULT_PAGE_SIZE,
+        validate=validate.Range(min=1, max=MAX_PAGE_SIZE)
+    )
+
+    @validates_schema
+    def validate_position(self, data, **kwargs):
+        if "since" not in data and "cursor" not in data:
+            raise ValidationError("Either since or cursor is required.")
+
+
+class ContactChangeSchema(Schema):
+    op = fields.Str()
+    id = fields.Int()
+    changed_at = fields.DateTime()
+    contact = fields.Nested(ContactSchema, required=False)
+
+
+class ContactChangesSchema(TimedSchema):
+    changes = fields.List(fields.Nested(ContactChangeSchema))
+    next_cursor = fields.Str()
+    has_more = fields.Bool()
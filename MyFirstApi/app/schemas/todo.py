@@ -1,9 +1,66 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import (
+    Schema,
+    ValidationError,
+    fields,
+    validate,
+    validates_schema,
+)
+from app.schemas.base import TimedSchema
 
 
-class TodoSchema(Schema):
+class TodoSchema(TimedSchema):
     id = fields.Int(dump_only=True)
     title = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     task = fields.Str(required=True)
     done = fields.Bool(load_default=False)
     created_at = fields.DateTime(dump_only=True)
+    version = fields.Int(dump_only=True)
+
+
+class TodoPatchSchema(TodoSchema):
+    """
+    TodoSchema with every field optional, for PATCH requests.
+    """
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("partial", True)
+        super().__init__(*args, **kwargs)
+
+
+class TodoFilterSchema(Schema):
+    done = fields.Bool(required=False)
+    title = fields.Str(
+        required=False,
+        validate=validate.Length(min=1),
+        metadata={"description": "Title prefix"}
+    )
+
+    @validates_schema
+    def validate_not_empty(self, data, **kwargs):
+        if not data:
+            raise ValidationError("The filter needs at least one condition.")
+
+
+class TodoBulkUpdateSchema(Schema):
+    ids = fields.List(
+        fields.Int(), validate=validate.Length(min=1, max=10000)
+    )
+    filter = fields.Nested(TodoFilterSchema)
+    done = fields.Bool(required=False)
+    delete = fields.Bool(load_default=False)
+
+    @validates_schema
+    def validate_operation(self, data, **kwargs):
+        if ("ids" in data) == ("filter" in data):
+            raise ValidationError("Give either ids or filter.")
+        if ("done" in data) == data["delete"]:
+            raise ValidationError("Give either done or delete=true.")
+
+
+class TodoBulkUpdateResultSchema(TimedSchema):
+    affected = fields.Int()
+
+
+class TodoStatsSchema(TimedSchema):
+    total = fields.Int()
+    done = fields.Int()
+    pending = fields.Int()
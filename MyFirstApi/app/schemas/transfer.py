@@ -0,0 +1,39 @@
+from marshmallow import Schema, fields, validate
+from webargs.fields import DelimitedList
+from app.schemas.base import TimedSchema
+from app.transfer import FORMATS, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE
+
+
+class ExportArgsSchema(Schema):
+    format = fields.Str(
+        load_default="ndjson", validate=validate.OneOf(FORMATS)
+    )
+    only = DelimitedList(
+        fields.Str(),
+        required=False,
+        data_key="fields",
+        metadata={"description": "Comma separated fields to export"}
+    )
+
+
+class ImportArgsSchema(Schema):
+    format = fields.Str(
+        load_default="ndjson", validate=validate.OneOf(FORMATS)
+    )
+    chunk_size = fields.Int(
+        load_default=DEFAULT_CHUNK_SIZE,
+        validate=validate.Range(min=1, max=MAX_CHUNK_SIZE)
+    )
+    upsert = fields.Bool(load_default=False)
+
+
+class ImportErrorSchema(Schema):
+    line = fields.Int()
+    errors = fields.Dict()
+
+
+class ImportResultSchema(TimedSchema):
+    imported = fields.Int()
+    rejected = fields.Int()
+    errors = fields.List(fields.Nested(ImportErrorSchema))
+    errors_truncated = fields.Bool()
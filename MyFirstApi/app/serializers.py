@@ -0,0 +1,101 @@
+from operator import attrgetter
+from marshmallow import fields
+from app.metrics import metrics
+from app.schemas import ContactSchema, TodoSchema
+
+
+def _converter(field):
+    """
+    Plain function equivalent to `field.serialize` for the field types
+    used by our schemas; other fields fall back to marshmallow.
+    """
+    if isinstance(field, fields.DateTime):
+        fmt = field.format or field.DEFAULT_FORMAT
+        format_func = field.SERIALIZATION_FUNCS.get(fmt)
+        if format_func is None:
+            return lambda value: (
+                None if value is None else value.strftime(fmt)
+            )
+        return lambda value: None if value is None else format_func(value)
+    if isinstance(field, fields.Integer) and not field.as_string:
+        return lambda value: None if value is None else int(value)
+    if isinstance(field, fields.String):
+        return lambda value: None if value is None else str(value)
+    if type(field) is fields.Boolean:
+        return lambda value: value
+    return None
+
+
+class CompiledSerializer:
+    """
+    Dumper for a fixed set of fields, built once by FastSerializer.
+    """
+
+    def __init__(self, schema, names):
+        self.names = names
+        self._plan = []
+        for name in names:
+            field = schema.fields[name]
+            convert = _converter(field)
+            if convert is None:
+                # Unknown field type: keep marshmallow semantics
+                self._plan.append((name, None, field))
+            else:
+                getter = attrgetter(field.attribute or name)
+                self._plan.append((name, getter, convert))
+
+    def dump(self, obj):
+        data = {}
+        for name, getter, convert in self._plan:
+            if getter is None:
+                data[name] = convert.serialize(name, obj)
+            else:
+                data[name] = convert(getter(obj))
+        return data
+
+    def dump_many(self, objs):
+        with metrics.timer("serialize"):
+            return [self.dump(obj) for obj in objs]
+
+
+class FastSerializer:
+    """
+    Precompiled, read-only alternative to `Schema(many=True).dump` for
+    list responses. Output matches the marshmallow schema it is built
+    from, restricted to an optional, validated subset of fields.
+    """
+
+    def __init__(self, schema_cls):
+        self.schema = schema_cls()
+        self.field_names = tuple(
+            name for name, field in self.schema.fields.items()
+            if not field.load_only
+        )
+        self._compiled = {}
+
+    def compile(self, only=None):
+        """
+        Return the CompiledSerializer for `only` (all fields when empty);
+        raises ValueError for names the schema does not dump.
+        """
+        key = tuple(sorted(set(only))) if only else None
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        if key is None:
+            names = self.field_names
+        else:
+            unknown = set(key) - set(self.field_names)
+            if unknown:
+                raise ValueError(
+                    f"Unknown fields: {', '.join(sorted(unknown))}."
+                )
+            names = tuple(n for n in self.field_names if n in key)
+
+        compiled = self._compiled[key] = CompiledSerializer(self.schema, names)
+        return compiled
+
+
+contact_serializer = FastSerializer(ContactSchema)
+todo_serializer = FastSerializer(TodoSchema)
@@ -0,0 +1,106 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from flask import current_app
+from sqlalchemy import and_, or_
+from app.database import db
+from app.models import ContactModel, ContactDeletionModel
+
+# Order of the two change streams when their timestamps are equal
+UPSERT = 0
+DELETE = 1
+
+
+def to_utc_naive(value):
+    """
+    Timestamps are stored as naive UTC DATETIME columns.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _after(ts_col, id_col, kind, position):
+    # Rows strictly after `position` in (timestamp, kind, id) order
+    timestamp, last_kind, last_id = position
+    if kind > last_kind:
+        return ts_col >= timestamp
+    if kind < last_kind:
+        return ts_col > timestamp
+    return or_(
+        ts_col > timestamp,
+        and_(ts_col == timestamp, id_col > last_id)
+    )
+
+
+def _stream(model, ts_col, kind, position, horizon, limit):
+    stmt = (
+        db.select(model)
+        .where(_after(ts_col, model.id, kind, position))
+        .where(ts_col <= horizon)
+        .order_by(ts_col, model.id)
+        .limit(limit + 1)
+    )
+    for row in db.session.execute(stmt).scalars():
+        yield getattr(row, ts_col.key), kind, row.id, row
+
+
+def contact_changes(position, limit):
+    """
+    Return contacts updated and deleted after `position`, oldest first,
+    as (changes, last position, has_more). Both tables are read through
+    their timestamp index, so the cost follows the number of changes.
+
+    Always reads the primary: a lagging replica could surface rows with
+    timestamps older than a cursor already handed out, and they would
+    never be synced. For the same reason changes younger than
+    SYNC_SETTLE_SECONDS are held back: timestamps are assigned by the
+    app before the commit, so transactions can commit out of order.
+    """
+    settle = current_app.config.get("SYNC_SETTLE_SECONDS", 2)
+    horizon = to_utc_naive(datetime.now(timezone.utc)) - timedelta(
+        seconds=settle
+    )
+    merged = heapq.merge(
+        _stream(
+            ContactModel,
+            ContactModel.updated_at,
+            UPSERT,
+            position,
+            horizon,
+            limit,
+        ),
+        _stream(
+            ContactDeletionModel,
+            ContactDeletionModel.deleted_at,
+            DELETE,
+            position,
+            horizon,
+            limit,
+        ),
+        key=lambda entry: entry[:3],
+    )
+    entries = list(islice(merged, limit + 1))
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changes = []
+    for timestamp, kind, _, row in entries:
+        if kind == UPSERT:
+            changes.append({
+                "op": "upsert",
+                "id": row.id,
+                "changed_at": timestamp,
+                "contact": row,
+            })
+        else:
+            changes.append({
+                "op": "delete",
+                "id": row.contact_id,
+                "changed_at": timestamp,
+            })
+
+    if entries:
+        position = entries[-1][:3]
+
+    return changes, position, has_more
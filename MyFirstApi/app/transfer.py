@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from flask import Response, current_app, stream_with_context
+from marshmallow import EXCLUDE, ValidationError
+from app.bulk import insert_chunk
+
+FORMATS = ("csv", "ndjson")
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+# Only the first rejections are detailed to keep the report bounded
+MAX_REPORTED_REJECTIONS = 1000
+
+
+def export_response(rows, field_names, fmt, filename):
+    """
+    Stream serialized `rows` as CSV (with a header line) or NDJSON.
+    """
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=field_names)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_ndjson():
+        dumps = current_app.json.dumps
+        for row in rows:
+            yield dumps(row) + "\n"
+
+    generate = generate_csv if fmt == "csv" else generate_ndjson
+    return Response(
+        stream_with_context(generate()),
+        mimetype=MIMETYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{fmt}"'
+        },
+    )
+
+
+def _records(stream, fmt):
+    """
+    Yield (line number, record) pairs parsed incrementally from `stream`;
+    records that cannot be parsed are yielded as ValueError instances.
+    """
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8",
+                            newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            # Empty cells mean "not provided" so column defaults apply
+            record = {
+                key: value for key, value in record.items()
+                if key is not None and value not in ("", None)
+            }
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as err:
+            yield line_number, ValueError(f"Invalid JSON: {err}")
+            continue
+        if not isinstance(record, dict):
+            record = ValueError("Each line must be a JSON object.")
+        yield line_number, record
+
+
+def import_stream(
+    model,
+    schema,
+    stream,
+    fmt,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    upsert=False,
+    conflict_key=None,
+    duplicate_message="Item already exists.",
+    precheck=None,
+    on_insert=None,
+):
+    """
+    Validate and insert records from an uploaded CSV / NDJSON stream,
+    committing every `chunk_size` valid rows. Memory stays bounded by the
+    chunk size; rejected rows are reported with their line number.
+    """
+    imported = 0
+    rejected = 0
+    errors = []
+
+    def reject(line_number, messages):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_REJECTIONS:
+            errors.append({"line": line_number, "errors": messages})
+
+    def flush(chunk):
+        nonlocal imported
+        failures = insert_chunk(
+            model, chunk, upsert, conflict_key, precheck, on_insert
+        )
+        imported += len(chunk) - len(failures)
+        for line_number, _ in chunk:
+            if line_number in failures:
+                reject(line_number, {"_schema": [duplicate_message]})
+
+    chunk = []
+    for line_number, record in _records(stream, fmt):
+        if isinstance(record, ValueError):
+            reject(line_number, {"_schema": [str(record)]})
+            continue
+        try:
+            # Exported files carry dump-only columns (id, timestamps)
+            chunk.append((line_number, schema.load(record, unknown=EXCLUDE)))
+        except ValidationError as err:
+            reject(line_number, err.messages)
+            continue
+
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+
+    if chunk:
+        flush(chunk)
+
+    return {
+        "imported": imported,
+        "rejected": rejected,
+        "errors": errors,
+        "errors_truncated": rejected > len(errors),
+    }
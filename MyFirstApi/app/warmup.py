@@ -0,0 +1,81 @@
+import logging
+import os
+import time
+import weakref
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+from app.database import db
+from app.metrics import metrics
+from app.serializers import contact_serializer, todo_serializer
+
+logger = logging.getLogger(__name__)
+
+# Apps built in this process, re-warmed in every forked worker
+_apps = weakref.WeakSet()
+_fork_hook_registered = False
+
+
+def prime_pool(app, connections):
+    """
+    Open up to `connections` pooled connections on every engine of `app`
+    and return them to the pool, so the first requests find them ready.
+    """
+    if connections <= 0:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if not isinstance(engine.pool, QueuePool):
+                continue
+
+            # Overflow connections would be closed again on check-in
+            opened = []
+            try:
+                for _ in range(min(connections, engine.pool.size())):
+                    opened.append(engine.connect())
+            except SQLAlchemyError:
+                logger.exception("Could not prime the connection pool")
+            finally:
+                for connection in opened:
+                    connection.close()
+
+
+def warm_up(app):
+    """
+    Do the per-process work that would otherwise land on the first
+    requests: configure mappers, compile the list serializers and open
+    DB_WARM_CONNECTIONS pooled connections.
+    """
+    configure_mappers()
+    contact_serializer.compile()
+    todo_serializer.compile()
+    prime_pool(app, app.config.get("DB_WARM_CONNECTIONS", 0))
+
+    global _fork_hook_registered
+    if not _fork_hook_registered:
+        os.register_at_fork(after_in_child=_after_fork)
+        _fork_hook_registered = True
+    _apps.add(app)
+
+
+def _after_fork():
+    """
+    Runs in every forked worker (gunicorn --preload, uWSGI without
+    lazy-apps). Connections inherited from the parent must not be used
+    by two processes, so drop them without closing the parent's sockets,
+    then prime a fresh pool for this worker.
+    """
+    for app in list(_apps):
+        start = time.perf_counter()
+        try:
+            with app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose(close=False)
+            prime_pool(app, app.config.get("DB_WARM_CONNECTIONS", 0))
+        except Exception:
+            # Exceptions raised in fork hooks are otherwise swallowed
+            logger.exception("Worker warm-up failed")
+        metrics.set_gauge(
+            "app_worker_warmup_seconds", time.perf_counter() - start
+        )
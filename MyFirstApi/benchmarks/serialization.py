@@ -0,0 +1,74 @@
+"""
+Compare the marshmallow list serialization with the precompiled fast
+serializer used by GET /contact. No database is needed.
+
+Usage (from the MyFirstApi directory):
+    python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+from app.models import ContactModel
+from app.schemas import ContactSchema
+from app.serializers import contact_serializer
+
+
+def make_contacts(count):
+    now = datetime.now(timezone.utc)
+    return [
+        ContactModel(
+            id=i,
+            name=f"Contact {i}",
+            email=f"contact{i}@example.com",
+            phone=f"{9000000000 + i}",
+            address="221B Baker Street",
+            city="London",
+            state="LDN",
+            zip="NW16XE",
+            country="UK",
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    contacts = make_contacts(args.rows)
+    schema = ContactSchema(many=True)
+    projected_schema = ContactSchema(many=True, only=("id", "name", "email"))
+    fast = contact_serializer.compile()
+    projected = contact_serializer.compile(["id", "name", "email"])
+
+    # Both paths must produce identical output before timing them
+    assert schema.dump(contacts) == fast.dump_many(contacts)
+    assert projected_schema.dump(contacts) == projected.dump_many(contacts)
+
+    cases = [
+        ("marshmallow, all fields", lambda: schema.dump(contacts)),
+        ("fast, all fields", lambda: fast.dump_many(contacts)),
+        ("marshmallow, id,name,email",
+         lambda: projected_schema.dump(contacts)),
+        ("fast, id,name,email", lambda: projected.dump_many(contacts)),
+    ]
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    baseline = None
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        if baseline is None or label.startswith("marshmallow"):
+            baseline = best
+        print(
+            f"{label:<30} {best * 1000:9.2f} ms"
+            f"  ({baseline / best:5.1f}x vs marshmallow)"
+        )
+
+
+if __name__ == "__main__":
+    main()
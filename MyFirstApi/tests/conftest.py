@@ -0,0 +1,36 @@
+import pytest
+from app import create_app
+from app.database import db
+from app.dedupe import contact_index
+
+
+@pytest.fixture
+def app_config(request):
+    """
+    Settings layered over the test defaults; parametrize indirectly,
+    e.g. @pytest.mark.parametrize("app_config", [{...}], indirect=True).
+    """
+    return getattr(request, "param", {})
+
+
+@pytest.fixture
+def app(app_config):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "RESPONSE_CACHE_TTL": 0,
+        **app_config,
+    })
+    # Only the default bind: `db` remembers bind keys (e.g. a replica)
+    # configured by earlier apps
+    with app.app_context():
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+    contact_index.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
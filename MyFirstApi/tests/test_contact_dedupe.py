@@ -0,0 +1,44 @@
+import pytest
+
+pytestmark = pytest.mark.parametrize(
+    "app_config",
+    [
+        {"CONTACT_DEDUPE_INDEX": True, "CONTACT_DEDUPE_VERIFY": True},
+        {"CONTACT_DEDUPE_INDEX": True, "CONTACT_DEDUPE_VERIFY": False},
+    ],
+    ids=["verify", "no-verify"],
+    indirect=True,
+)
+
+
+def contact(n, **fields):
+    return {
+        "name": f"Contact {n}",
+        "email": f"contact{n}@example.com",
+        "phone": f"{n:010d}",
+        **fields,
+    }
+
+
+def test_patched_away_email_can_be_reused(client):
+    assert client.post("/contact", json=contact(1)).status_code == 201
+    response = client.patch("/contact/1", json={"email": "new@example.com"})
+    assert response.status_code == 204
+
+    reused = contact(2, email=contact(1)["email"])
+    response = client.post("/contact", json=reused)
+    assert response.status_code == 201, response.get_json()
+    # The unchanged phone is still indexed
+    reused = contact(3, phone=contact(1)["phone"])
+    response = client.post("/contact", json=reused)
+    assert response.status_code == 400
+
+
+def test_verification_compares_normalized_values(client):
+    assert client.post("/contact", json=contact(1)).status_code == 201
+
+    response = client.post(
+        "/contact", json=contact(2, email="CONTACT1@Example.com")
+    )
+    assert response.status_code == 400
+    assert "already exists" in response.get_json()["message"]
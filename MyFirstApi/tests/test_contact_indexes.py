@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import event
+from app.database import db
+
+
+def query_plans(client, url):
+    """
+    GET `url` and return the EXPLAIN QUERY PLAN details of every SELECT
+    on contacts it issued.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, many):
+        if statement.startswith("SELECT") and "FROM contacts" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, response.get_json()
+
+    with db.engine.connect() as conn:
+        return [
+            " ".join(
+                row[-1] for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            )
+            for statement, parameters in statements
+        ]
+
+
+@pytest.mark.parametrize("url, index", [
+    ("/contact?city=Pune", "ix_contacts_city_name (city=?)"),
+    ("/contact?city=Pune&sort=name", "ix_contacts_city_name (city=?)"),
+    ("/contact?state=MH&sort=-name", "ix_contacts_state_name (state=?)"),
+    (
+        "/contact?country=IN&state=MH",
+        "ix_contacts_country_state_city (country=? AND state=?)",
+    ),
+    (
+        "/contact?country=IN&state=MH&city=Pune",
+        "ix_contacts_country_state_city (country=? AND state=? AND city=?)",
+    ),
+])
+def test_filters_search_an_index(client, url, index):
+    (plan,) = query_plans(client, url)
+    assert f"SEARCH contacts USING INDEX {index}" in plan
+
+
+def test_name_prefix_range_scans_the_name_index(client):
+    # SQLite only range-scans LIKE when it is case sensitive; MySQL's
+    # case-insensitive collations do so for a prefix pattern as is
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA case_sensitive_like = ON")
+
+    (plan,) = query_plans(client, "/contact?name=An_")
+    assert (
+        "SEARCH contacts USING INDEX ix_contacts_name (name>? AND name<?)"
+        in plan
+    )
+
+
+def test_name_sort_walks_the_name_index(client):
+    (plan,) = query_plans(client, "/contact?sort=name")
+    assert "USING INDEX ix_contacts_name" in plan
+    assert "TEMP B-TREE" not in plan
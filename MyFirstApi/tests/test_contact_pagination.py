@@ -0,0 +1,29 @@
+def create_contact(client, n):
+    response = client.post("/contact", json={
+        "name": f"Contact {n}",
+        "email": f"contact{n}@example.com",
+        "phone": f"{n:010d}",
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["id"]
+
+
+def test_name_sorted_page_after_deleted_row_is_rejected(client):
+    contact_id = create_contact(client, 1)
+    create_contact(client, 2)
+    assert client.delete(f"/contact/{contact_id}").status_code == 204
+
+    for stream in ("false", "true"):
+        response = client.get(
+            f"/contact?sort=name&after={contact_id}&stream={stream}"
+        )
+        assert response.status_code == 400
+        assert "no longer exists" in response.get_json()["message"]
+
+
+def test_stream_returns_every_row_after_the_anchor(client):
+    ids = [create_contact(client, n) for n in range(1, 4)]
+
+    response = client.get(f"/contact?sort=name&after={ids[0]}&stream=true")
+    assert response.status_code == 200
+    assert [row["id"] for row in response.get_json()] == ids[1:]
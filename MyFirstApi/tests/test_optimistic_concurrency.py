@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import event
+from app.database import db
+from app.models import ContactModel, TodoModel
+
+
+def bump_version_before_flush(model, row_id):
+    """
+    Make the next flush lose a race: bump the row's version, as a
+    concurrent PATCH would, right before the ORM writes.
+    """
+    def bump(session, flush_context, instances):
+        session.execute(
+            db.update(model)
+            .where(model.id == row_id)
+            .values(version=model.version + 1)
+            # Leave the loaded object at its old version
+            .execution_options(synchronize_session=False)
+        )
+
+    event.listen(db.session, "before_flush", bump, once=True)
+
+
+@pytest.mark.parametrize("url, model, body", [
+    ("/contact", ContactModel, {
+        "name": "Ann", "email": "ann@example.com", "phone": "1234567890"
+    }),
+    ("/todo", TodoModel, {"title": "Write", "task": "Write tests"}),
+])
+def test_delete_racing_an_update_fails_with_412(client, url, model, body):
+    row_id = client.post(url, json=body).get_json()["id"]
+
+    bump_version_before_flush(model, row_id)
+    response = client.delete(f"{url}/{row_id}")
+    assert response.status_code == 412
+
+    # Nothing was deleted, and the row can still be removed afterwards
+    assert client.get(f"{url}/{row_id}").status_code == 200
+    assert client.delete(f"{url}/{row_id}").status_code == 204
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import event
+from app.database import db, READ_PRIMARY_COOKIE, REPLICA_BIND
+
+pytestmark = pytest.mark.parametrize("app_config", [{
+    "SQLALCHEMY_BINDS": {REPLICA_BIND: "sqlite://"},
+    "REPLICA_LAG_WINDOW": 5,
+}], indirect=True)
+
+
+@pytest.fixture
+def reads(app):
+    """
+    Names of the engines ("primary" / "replica") each statement ran on.
+    """
+    db.metadata.create_all(db.engines[REPLICA_BIND])
+    seen = []
+    for name, engine in (("primary", db.engine),
+                         ("replica", db.engines[REPLICA_BIND])):
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args, name=name: seen.append(name),
+        )
+    return seen
+
+
+def test_writer_reads_the_primary_others_the_replica(app, reads):
+    writer, reader = app.test_client(), app.test_client()
+    response = writer.post("/todo", json={"title": "Write", "task": "Docs"})
+    assert READ_PRIMARY_COOKIE in response.headers["Set-Cookie"]
+
+    reads.clear()
+    writer.get("/todo")
+    assert reads == ["primary"]
+
+    reads.clear()
+    reader.get("/todo")
+    assert reads == ["replica"]
+
+
+def test_expired_pin_reads_the_replica(app, reads):
+    client = app.test_client()
+    client.set_cookie(READ_PRIMARY_COOKIE, "1.0")
+
+    client.get("/todo")
+    assert reads == ["replica"]
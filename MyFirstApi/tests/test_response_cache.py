@@ -0,0 +1,26 @@
+import pytest
+
+pytestmark = pytest.mark.parametrize(
+    "app_config", [{"RESPONSE_CACHE_TTL": 60}], indirect=True
+)
+
+
+def test_views_of_one_namespace_are_cached_apart(client):
+    client.post("/todo", json={"title": "Write", "task": "Write tests"})
+
+    todos = client.get("/todo")
+    stats = client.get("/todo/stats")
+    assert stats.headers["X-Cache"] == "MISS"
+    assert stats.get_json() == {"total": 1, "done": 0, "pending": 1}
+    assert client.get("/todo").get_json() == todos.get_json()
+
+
+def test_writes_drop_cached_stats(client):
+    client.post("/todo", json={"title": "Write", "task": "Write tests"})
+    assert client.get("/todo/stats").get_json()["done"] == 0
+    assert client.get("/todo/stats").headers["X-Cache"] == "HIT"
+
+    client.put("/todo/1", json={
+        "title": "Write", "task": "Write tests", "done": True
+    })
+    assert client.get("/todo/stats").get_json()["done"] == 1
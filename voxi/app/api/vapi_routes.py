@@ -1,120 +1,309 @@
-from fastapi import APIRouter, Request
+import asyncio
+import logging
+import httpx
+from fastapi import APIRouter, Depends, Request
+from app.core.config import get_settings, Settings
+from app.core.metrics import metrics
 from app.services.calendar_service import (
     check_calendar_availability,
-    CAL_API_BASE_URL,
-    CAL_API_KEY,
-    CAL_API_VERSION
+    check_calendar_range,
+    create_booking,
+    first_available_slots,
+    get_cal_client,
+    invalidate_availability,
+    slot_start,
+)
+from app.services.idempotency import booking_store, idempotency_key
+from app.services.slot_index import (
+    parse_spoken_day,
+    spoken_time_candidates,
+    SlotIndex,
 )
-import requests
 from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 router = APIRouter(prefix="/vapi", tags=["vapi"])
 
-HEADERS = {
-    "Authorization": f"Bearer {CAL_API_KEY}",
-    "cal-api-version": CAL_API_VERSION,
-    "Content-Type": "application/json"
-}
+logger = logging.getLogger(__name__)
 
+# Said before slots served from the stale cache while Cal.com is down
+STALE_PREFIX = (
+    "I can't reach the live calendar right now, so these times are from "
+    "my last check and will be confirmed when booking.\n"
+)
 
-@router.post("/check-availability")
-async def vapi_check_availability(request: Request):
-    data = await request.json()
 
-    # 1. Extract the Tool Call ID (Vapi MUST have this back)
-    message = data.get("message", {})
-    tool_calls = message.get("toolCalls", [])
+async def _run_tool_calls(
+    request: Request,
+    handle: Callable[[Dict[str, Any]], Awaitable[str]],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Run `handle` on every tool call of a Vapi webhook, `concurrency` at a
+    time, and return one result per toolCallId, in request order. A
+    failing call gets an apology instead of failing the whole webhook.
+    """
+    with metrics.timer("parse"):
+        data = await request.json()
+        message = data.get("message", {})
+        tool_calls = message.get("toolCalls", [])
     if not tool_calls:
         return {"error": "No tool calls found"}
 
-    tool_call = tool_calls[0]
-    tool_call_id = tool_call.get("id")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result_string = await handle(tool_call)
+            except Exception:
+                logger.exception(
+                    "Tool call failed",
+                    extra={"fields": {"tool_call_id": tool_call.get("id")}},
+                )
+                result_string = (
+                    "Sorry, something went wrong on my side with that "
+                    "request."
+                )
+        # Vapi matches results to calls by toolCallId
+        return {"toolCallId": tool_call.get("id"), "result": result_string}
+
+    results: List[Dict[str, Any]] = await asyncio.gather(
+        *(run(tool_call) for tool_call in tool_calls)
+    )
+    with metrics.timer("build"):
+        return {"results": results}
+
 
-    # 2. Extract the date from Vapi's arguments
-    arguments = tool_call.get("function", {}).get("arguments", {})
-    date_str = arguments.get("date")
+def _arguments(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+    return tool_call.get("function", {}).get("arguments", {})
+
+
+def _hosts(args: Dict[str, Any], settings: Settings) -> List[str]:
+    """
+    The configured host named by the optional `host` argument, or all.
+    """
+    host = args.get("host") if isinstance(args, dict) else None
+    if isinstance(host, str):
+        for known in settings.hosts:
+            if known.lower() == host.strip().lower():
+                return [known]
+    return settings.hosts
+
+
+def _with_hosts(label: str, hosts: List[str], avail: Dict[str, Any]) -> str:
+    # Only worth saying when the answer covers more than one host
+    if len(avail.get("hosts", [])) > 1 and hosts:
+        return f"{label} (with {', '.join(hosts)})"
+    return label
+
+
+@router.post("/check-availability")
+async def vapi_check_availability(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_cal_client),
+    settings: Settings = Depends(get_settings),
+):
+    return await _run_tool_calls(
+        request,
+        lambda tool_call: _check_availability(client, tool_call, settings),
+        settings.tool_call_concurrency,
+    )
+
+
+async def _check_availability(
+    client: httpx.AsyncClient, tool_call: Dict[str, Any], settings: Settings
+) -> str:
+    # 1. Extract the date from Vapi's arguments
+    args = _arguments(tool_call)
+    date_str = args.get("date")
+
+    # 2. Call your working calendar service
+    avail = await check_calendar_availability(
+        client, date_str, settings=settings, hosts=_hosts(args, settings)
+    )
 
-    # 3. Call your working calendar service
-    avail = check_calendar_availability(date_str)
+    # 3. Format the result for Vapi
+    with metrics.timer("format"):
+        return _format_availability(date_str, avail)
 
-    # 4. Format the result for Vapi
+
+def _format_availability(date_str: str, avail: Dict[str, Any]) -> str:
     if avail.get("status") == "success":
         slots_data = avail.get("slots", {})
         # slots_data is a dict like {"2026-02-12": [{"time": "..."}, ...]}
         date_slots = slots_data.get(date_str, [])
 
         if not date_slots:
-            result_string = f"No slots available for {date_str}."
+            return f"No slots available for {date_str}."
+
+        formatted = []
+        for s in date_slots[:5]:
+            time_str = s.get("time")  # Cal.com v2 uses "time", not "start"
+            if time_str and isinstance(time_str, str):
+                try:
+                    formatted.append(_with_hosts(
+                        _slot_label(datetime.fromisoformat(time_str)),
+                        s.get("hosts", []),
+                        avail,
+                    ))
+                except ValueError:
+                    formatted.append(time_str)
+
+        result_string = (
+            f"Available slots for {date_str}:\n" + "\n".join(formatted)
+        )
+        if avail.get("stale"):
+            result_string = STALE_PREFIX + result_string
+        if formatted:
+            result_string += "\nWhich time works best for you?"
         else:
-            formatted = []
-            for s in date_slots[:5]:
-                time_str = s.get("time")  # Cal.com v2 uses "time", not "start"
-                if time_str and isinstance(time_str, str):
-                    try:
-                        dt = datetime.fromisoformat(time_str)
-                        start = dt.strftime("%I:%M %p")
-                        end = (dt + timedelta(minutes=30)).strftime("%I:%M %p")
-                        formatted.append(f"{start} - {end}")
-                    except ValueError:
-                        formatted.append(time_str)
+            result_string += "\nNo times available that day."
+        return result_string
 
-            result_string = (
-                f"Available slots for {date_str}:\n" + "\n".join(formatted)
-            )
-            if formatted:
-                result_string += "\nWhich time works best for you?"
-            else:
-                result_string += "\nNo times available that day."
-    else:
-        print(f"DEBUG: Availability failed with: {avail}")
+    logger.info(
+        "Availability lookup failed",
+        extra={"fields": {"date": date_str, "result": avail}},
+    )
+    error_msg = avail.get("message", "Unknown error")
+    return (
+        "Sorry, I couldn't check the calendar: "
+        f"{error_msg}. Try a future date?"
+    )
+
+
+@router.post("/check-availability-range")
+async def vapi_check_availability_range(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_cal_client),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Answer "when is the next free slot?" with one Cal.com request for the
+    whole window. Arguments: from, to (optional, default a week), after
+    (optional ISO time, default now) and limit (optional, default 3).
+    """
+    return await _run_tool_calls(
+        request,
+        lambda tool_call: _check_availability_range(
+            client, tool_call, settings
+        ),
+        settings.tool_call_concurrency,
+    )
+
+
+async def _check_availability_range(
+    client: httpx.AsyncClient, tool_call: Dict[str, Any], settings: Settings
+) -> str:
+    arguments = _arguments(tool_call)
+
+    tz = ZoneInfo(settings.default_timezone)
+    now = datetime.now(tz)
+    after = _parse_after(arguments.get("after"), tz) or now
+    start_str = arguments.get("from") or after.date().isoformat()
+    try:
+        limit = max(1, min(int(arguments.get("limit", 3)), 10))
+    except (TypeError, ValueError):
+        limit = 3
+
+    avail = await check_calendar_range(
+        client,
+        start_str,
+        arguments.get("to"),
+        settings=settings,
+        hosts=_hosts(arguments, settings),
+    )
+
+    with metrics.timer("format"):
+        return _format_range(avail, after, limit, tz)
+
+
+def _format_range(
+    avail: Dict[str, Any], after: datetime, limit: int, tz: ZoneInfo
+) -> str:
+    if avail.get("status") != "success":
         error_msg = avail.get("message", "Unknown error")
-        result_string = (
+        return (
             "Sorry, I couldn't check the calendar: "
-            f"{error_msg}. Try a future date?"
+            f"{error_msg}. Try different dates?"
         )
 
-    # 5. Return the exact JSON structure Vapi requires
-    return {
-        "results": [
-            {
-                "toolCallId": tool_call_id,
-                "result": result_string
-            }
-        ]
+    starts = first_available_slots(avail["days"], after, limit)
+    if not starts:
+        return (
+            f"No slots available between {avail['from']} "
+            f"and {avail['to']}."
+        )
+
+    hosts_at = {
+        slot_start(slot): slot.get("hosts", [])
+        for slots in avail["days"].values()
+        for slot in slots
     }
+    formatted = [
+        _with_hosts(
+            start.astimezone(tz).strftime("%A %B %d, ")
+            + _slot_label(start.astimezone(tz)),
+            hosts_at.get(start, []),
+            avail,
+        )
+        for start in starts
+    ]
+    result_string = (
+        "The next available slots are:\n" + "\n".join(formatted)
+        + "\nWhich time works best for you?"
+    )
+    if avail.get("stale"):
+        result_string = STALE_PREFIX + result_string
+    return result_string
+
+
+def _slot_label(start: datetime) -> str:
+    end = start + timedelta(minutes=30)
+    return f"{start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}"
+
+
+def _parse_after(value, tz):
+    """
+    Parse an ISO time, taking naive values in `tz`; None if absent/invalid.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        after = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return after if after.tzinfo else after.replace(tzinfo=tz)
 
 
 @router.post("/book-appointment")
-async def vapi_book_appointment(request: Request):
-    data = await request.json()
-    message = data.get("message", {})
-    tool_calls = message.get("toolCalls", [])
-    if not tool_calls:
-        return {"error": "No tool calls found"}
+async def vapi_book_appointment(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_cal_client),
+    settings: Settings = Depends(get_settings),
+):
+    return await _run_tool_calls(
+        request,
+        lambda tool_call: _book_appointment(client, tool_call, settings),
+        settings.tool_call_concurrency,
+    )
 
-    tool_call = tool_calls[0]
-    tool_call_id = tool_call.get("id")
-    args = tool_call.get("function", {}).get("arguments", {})
 
-    print(f"BOOKING REQUEST RECEIVED: args = {args}")
+async def _book_appointment(
+    client: httpx.AsyncClient, tool_call: Dict[str, Any], settings: Settings
+) -> str:
+    args = _arguments(tool_call)
 
     if not args or not isinstance(args, dict):
-        result_string = (
+        return (
             "Sorry, I need name, email, and time to book."
             "Can you provide them again?"
         )
-        return {
-            "results": [
-                {
-                    "toolCallId": tool_call_id,
-                    "result": result_string
-                }
-            ]
-        }
 
     # Email parsing — make it robust
     raw_email = args.get("email", "").lower().strip()
-    print(f"see raw email value ::: {raw_email}")
     email = (
         raw_email.replace(" dot ", ".")
         .replace("dot", ".")
@@ -123,64 +312,197 @@ async def vapi_book_appointment(request: Request):
         .replace(" ", "")
     )
 
-    print(f"Parsed email ::: {email}")
     # Basic validation
     if "@" not in email or "." not in email.split("@")[-1]:
-        result_string = (
+        return (
             "Sorry, the email doesn't look valid."
             "Please provide a correct email."
         )
-        return {
-            "results": [{"toolCallId": tool_call_id, "result": result_string}]
-        }
-
-    # Start time — assume Vapi sends ISO or "HH:MM AM/PM"
-    start_time = args.get("time")
-    if not start_time:
-        result_string = "Sorry, I need a time to book the appointment."
-        return {
-            "results": [{"toolCallId": tool_call_id, "result": result_string}]
-        }
+
+    if not args.get("time"):
+        return "Sorry, I need a time to book the appointment."
+
+    slug = args.get("event_type")
+    hosts = _hosts(args, settings)
+    if _event_type_id(settings, slug, hosts) is None:
+        return "Sorry, I can't book that kind of appointment."
+
+    # Vapi retries slow webhooks: a retry (same toolCallId) gets the
+    # first attempt's outcome, even though the slot it booked is no
+    # longer free, instead of resolving the time again
+    tool_call_id = tool_call.get("id")
+    if not tool_call_id:
+        result_string, _ = await _resolve_and_book(
+            client, args, email, slug, hosts, settings
+        )
+        return result_string
+    result_string, _ = await booking_store.run(
+        [("call", tool_call_id)],
+        lambda: _resolve_and_book(client, args, email, slug, hosts, settings),
+        replayable=lambda result: result[1],
+    )
+    return result_string
+
+
+async def _resolve_and_book(
+    client: httpx.AsyncClient,
+    args: Dict[str, Any],
+    email: str,
+    slug: Optional[str],
+    hosts: List[str],
+    settings: Settings,
+) -> Tuple[str, bool]:
+    """
+    Match the requested time to a slot and book it. Returns the message
+    for the caller and whether Cal.com accepted the booking.
+    """
+    # Only a start Cal.com offered is sent, so a misheard or taken time
+    # is answered from the slot cache instead of a failed booking
+    start_time, free_hosts, message = await _resolve_start(
+        client, args, settings, hosts
+    )
+    if start_time is None:
+        return message, False
+    # The first free host (in configured order) takes the appointment
+    event_type_id = _event_type_id(settings, slug, free_hosts)
+    if event_type_id is None:
+        return "Sorry, I can't book that kind of appointment.", False
 
     # Minimal payload
     payload = {
         "start": start_time,
-        "eventTypeId": 4648515,
+        "eventTypeId": event_type_id,
         "attendee": {
             "name": args.get("name", "Guest"),
             "email": email,
-            "timeZone": "Asia/Kolkata"
+            "timeZone": settings.default_timezone
         },
         "metadata": {}
     }
 
-    print(f"BOOKING PAYLOAD: {payload}")
-    print(f"Headers: {HEADERS}")
-    url = f"{CAL_API_BASE_URL}/v2/bookings"
-    print(f"Booking URL: {url}")
-    try:
-        print("Sending POST to Cal.com...")
-        response = requests.post(
-            url,
-            json=payload,
-            headers=HEADERS,
-            timeout=15.0
+    # The same attendee asking for the same start again, under another
+    # toolCallId, must not book twice either
+    key = idempotency_key(payload["eventTypeId"], email, start_time)
+    return await booking_store.run(
+        [("booking", key)],
+        lambda: _submit_booking(client, payload, key, settings),
+        replayable=lambda result: result[1],
+    )
+
+
+def _event_type_id(
+    settings: Settings, slug: Optional[str], hosts: List[str]
+) -> Optional[int]:
+    for host in hosts:
+        event_type_id = settings.event_type_id(slug, host)
+        if event_type_id is not None:
+            return event_type_id
+    return settings.event_type_id(slug)
+
+
+async def _resolve_start(
+    client: httpx.AsyncClient,
+    args: Dict[str, Any],
+    settings: Settings,
+    hosts: List[str],
+) -> Tuple[Optional[str], List[str], str]:
+    """
+    Match the spoken `time` (and optional `date`) to a slot of `hosts`.
+    Returns (slot start in UTC ISO format, hosts free then, "") or
+    (None, [], what to say).
+    """
+    tz = ZoneInfo(settings.default_timezone)
+    day = parse_spoken_day(args.get("date"), tz)
+    candidates = spoken_time_candidates(str(args["time"]), day, tz)
+    if not candidates:
+        metrics.increment("booking_time_matches_total", outcome="unparsed")
+        if day is None:
+            return None, [], (
+                "Sorry, which day and time would you like? For example, "
+                "3 pm tomorrow."
+            )
+        return None, [], (
+            "Sorry, I didn't catch the time. Could you say it again, "
+            "for example 3 pm or 15:30?"
+        )
+
+    # Every reading of an ambiguous hour falls on the same date
+    day_str = candidates[0].date().isoformat()
+    avail = await check_calendar_availability(
+        client, day_str, args.get("event_type"), settings=settings,
+        hosts=hosts,
+    )
+    if avail.get("status") != "success":
+        metrics.increment("booking_time_matches_total", outcome="error")
+        error_msg = avail.get("message", "Unknown error")
+        return None, [], (
+            "Sorry, I couldn't check that time: "
+            f"{error_msg}. Could you pick another day?"
         )
 
-        print(f"CAL.COM BOOKING STATUS: {response.status_code}")
-        print(f"CAL.COM BOOKING RESPONSE: {response.text}")
+    index = SlotIndex(avail["slots"])
+    # "3" is 3 pm unless only the morning has slots
+    when = index.choose(candidates)
+    slot, nearest = index.match(when)
+    if slot is not None:
+        metrics.increment("booking_time_matches_total", outcome="exact")
+        start = slot.astimezone(dt_timezone.utc).isoformat()
+        return start.replace("+00:00", "Z"), index.hosts(slot), ""
+
+    when_label = when.strftime("%I:%M %p on %A %B %d")
+    if not nearest:
+        metrics.increment("booking_time_matches_total", outcome="day_full")
+        return None, [], (
+            f"Sorry, {when_label} isn't available and there are no open "
+            "times that day. Would another day work?"
+        )
+    metrics.increment("booking_time_matches_total", outcome="alternative")
+    options = " or ".join(
+        start.astimezone(tz).strftime("%I:%M %p") for start in nearest
+    )
+    return None, [], (
+        f"Sorry, {when_label} isn't available. The closest open times are "
+        f"{options}. Would one of those work?"
+    )
+
+
+async def _submit_booking(
+    client: httpx.AsyncClient,
+    payload: Dict[str, Any],
+    key: str,
+    settings: Settings,
+) -> Tuple[str, bool]:
+    """
+    POST the booking; return the caller-facing result and whether Cal.com
+    accepted the request (so the result must be replayed, not retried).
+    """
+    start_time = payload["start"]
+    accepted = False
+    logger.debug("Booking request", extra={"fields": {"payload": payload}})
+    try:
+        response = await create_booking(
+            client, payload, idempotency_key=key, settings=settings
+        )
 
         if response.status_code in [200, 201]:
+            accepted = True
             try:
                 data = response.json()
                 if data.get("status") == "success":
-                    print(f"CAL.COM BOOKING SUCCESS STATUS IN BODY**: {data}")
+                    logger.info(
+                        "Booking created",
+                        extra={"fields": {"start": start_time}},
+                    )
+                    invalidate_availability(start_time, settings)
                     result_string = (
                         "Successfully booked! "
                         "You will receive an email confirmation shortly."
                     )
                 else:
-                    print(f"CAL.COM BOOKING FAILED IN BODY: {data}")
+                    logger.warning(
+                        "Booking rejected by Cal.com",
+                        extra={"fields": {"response": data}},
+                    )
                     result_string = (
                         "Sorry, booking failed — Cal.com returned an error."
                     )
@@ -189,23 +511,23 @@ async def vapi_book_appointment(request: Request):
                     "Booking may have succeeded but response was invalid."
                 )
         else:
+            logger.warning(
+                "Booking failed",
+                extra={"fields": {
+                    "status": response.status_code,
+                    "response": response.text,
+                }},
+            )
             result_string = (
                 f"Sorry, booking failed (error {response.status_code}). "
                 "Can you try again?"
             )
 
-    except Exception as e:
-        print(f"SERVER ERROR during booking: {str(e)}")
+    except Exception:
+        logger.exception("Booking request errored")
         result_string = (
             "It looks like there was a technical issue while booking your "
-            "appointment. Let me try that again."
+            "appointment, so I couldn't confirm it yet."
         )
 
-    return {
-        "results": [
-            {
-                "toolCallId": tool_call_id,
-                "result": result_string
-            }
-        ]
-    }
+    return result_string, accepted
@@ -0,0 +1,136 @@
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class Settings(BaseModel):
+    """
+    Deployment settings. Every field is read from the upper-cased
+    environment variable of the same name (e.g. SLOT_CACHE_TTL=60), so
+    performance knobs can be tuned per deployment without code edits.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    # Cal.com API
+    cal_api_base_url: str = "https://api.cal.com"
+    cal_booking_base_url: str = "https://cal.com"
+    cal_api_version: str = ""
+    cal_api_key: Optional[str] = None
+    cal_username: Optional[str] = None
+    # Team members whose slots are merged (comma separated in CAL_HOSTS);
+    # empty means CAL_USERNAME alone
+    cal_hosts: List[str] = []
+    default_timezone: str = "Asia/Kolkata"
+    default_event_slug: str = "30min"
+    # Event type slug -> Cal.com event type id, as JSON in CAL_EVENT_TYPES;
+    # "host/slug" keys give a host's own event type
+    cal_event_types: Dict[str, int] = {"30min": 4648515}
+
+    # Timeouts (seconds); REQUEST_BUDGET bounds a whole request except
+    # the booking POST, which gets CAL_BOOKING_TIMEOUT on its own
+    request_budget: float = 2.5
+    cal_timeout: float = 10.0
+    cal_booking_timeout: float = 15.0
+
+    # Connection pool to Cal.com, one per worker process
+    cal_max_connections: int = 100
+    cal_max_keepalive: int = 20
+    cal_keepalive_expiry: float = 30.0
+
+    # Slot lookups: hedging, retries and stale fallback
+    slot_cache_ttl: float = 30.0
+    slot_cache_maxsize: int = 512
+    slot_hedge_after: float = 0.8
+    slot_retries: int = 2
+    slot_retry_backoff: float = 0.1
+    serve_stale_slots: bool = True
+    stale_slots_max_age: float = 600.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    breaker_min_timeout: float = 1.0
+
+    # Booking idempotency
+    idempotency_ttl: float = 900.0
+    idempotency_maxsize: int = 1024
+
+    # Background availability prefetch; PREFETCH_INTERVAL should stay
+    # below SLOT_CACHE_TTL so prefetched days never expire in between
+    prefetch_enabled: bool = True
+    prefetch_days: int = 7
+    prefetch_interval: float = 20.0
+    prefetch_jitter: float = 0.1
+    prefetch_max_backoff: float = 300.0
+    # Comma separated in PREFETCH_EVENT_SLUGS; empty means the default
+    prefetch_event_slugs: List[str] = []
+
+    tool_call_concurrency: int = 8
+    log_level: str = "INFO"
+
+    @field_validator("cal_event_types", mode="before")
+    @classmethod
+    def _parse_event_types(cls, value: Any) -> Any:
+        return json.loads(value) if isinstance(value, str) else value
+
+    @field_validator("cal_hosts", "prefetch_event_slugs", mode="before")
+    @classmethod
+    def _parse_list(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    @field_validator("log_level")
+    @classmethod
+    def _upper(cls, value: str) -> str:
+        return value.upper()
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Settings":
+        values = {
+            name: environ[name.upper()]
+            for name in cls.model_fields
+            if environ.get(name.upper())
+        }
+        return cls(**values)
+
+    def require_credentials(self) -> None:
+        """
+        Raise ValueError when the Cal.com credentials are missing.
+        """
+        if not self.cal_api_key:
+            raise ValueError(
+                "CAL_API_KEY is not set in the environment variables"
+            )
+        if not self.hosts:
+            raise ValueError(
+                "CAL_USERNAME is not set in the environment variables"
+            )
+
+    @property
+    def hosts(self) -> List[str]:
+        if self.cal_hosts:
+            return self.cal_hosts
+        return [self.cal_username] if self.cal_username else []
+
+    def event_type_id(
+        self, slug: Optional[str] = None, host: Optional[str] = None
+    ) -> Optional[int]:
+        slug = slug or self.default_event_slug
+        if host is not None and f"{host}/{slug}" in self.cal_event_types:
+            return self.cal_event_types[f"{host}/{slug}"]
+        return self.cal_event_types.get(slug)
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    The settings of this process, loaded from .env and the environment
+    on first use. FastAPI dependency: tests override it through
+    `app.dependency_overrides`, or change the environment and call
+    `get_settings.cache_clear()`.
+    """
+    load_dotenv()
+    return Settings.from_env()
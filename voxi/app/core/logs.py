@@ -0,0 +1,105 @@
+import json
+import logging
+import logging.handlers
+import queue
+import re
+from typing import Any, Iterable, Optional
+
+REDACTED = "[REDACTED]"
+SECRET_KEYS = re.compile(
+    r"authorization|api[_-]?key|token|secret|password", re.IGNORECASE
+)
+SECRET_PATTERNS = (
+    re.compile(r"(Bearer\s+)[^\s'\",}]+", re.IGNORECASE),
+    re.compile(r"\bcal_(?:live|test)_[A-Za-z0-9]+"),
+    re.compile(
+        r"((?:authorization|api[_-]?key|token|secret|password)['\"]?"
+        r"\s*[:=]\s*['\"]?)[^\s'\",}]+",
+        re.IGNORECASE,
+    ),
+)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message and the
+    `fields` passed as `extra`, with secrets masked.
+    """
+
+    def __init__(self, secrets: Iterable[str] = ()):
+        super().__init__()
+        # Very short values would mask ordinary words
+        self.secrets = [s for s in secrets if s and len(s) >= 8]
+
+    def redact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: REDACTED if SECRET_KEYS.search(str(key))
+                else self.redact(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self.redact(item) for item in value]
+        if not isinstance(value, str):
+            return value
+        for secret in self.secrets:
+            value = value.replace(secret, REDACTED)
+        for pattern in SECRET_PATTERNS:
+            value = pattern.sub(
+                lambda m: (m.group(1) if m.lastindex else "") + REDACTED,
+                value,
+            )
+        return value
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": self.redact(record.getMessage()),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(self.redact(fields))
+        return json.dumps(entry, default=str)
+
+
+def start_logging(secrets: Iterable[str] = (), level: str = "INFO"):
+    """
+    Route the `app` loggers through a queue so request handlers never
+    block on stream I/O; a listener thread formats and writes the lines.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter(secrets))
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """
+    Flush the queue and stop the listener thread.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+    logger = logging.getLogger("app")
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
@@ -0,0 +1,102 @@
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Latest samples kept per series for the quantiles
+SAMPLE_WINDOW = 2048
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, object]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _quantiles(samples) -> Dict[float, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    # Nearest-rank percentiles
+    return {
+        q: ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+        for q in QUANTILES
+    }
+
+
+def _fmt(labels, **extra) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Metrics:
+    """
+    In-process latency summaries (p50 / p95 / p99 over a sliding window
+    of samples), counters and gauges, exported in the Prometheus text
+    format. Everything runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(self, window: int = SAMPLE_WINDOW):
+        self.window = window
+        self._samples: Dict[LabelKey, Deque[float]] = {}
+        self._totals: Dict[LabelKey, list] = {}
+        self._counters: Dict[LabelKey, float] = {}
+        self._gauges: Dict[LabelKey, float] = {}
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+            self._totals[key] = [0, 0.0]
+        samples.append(value)
+        totals = self._totals[key]
+        totals[0] += 1
+        totals[1] += value
+
+    def increment(self, name: str, amount: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        self._gauges[_key(name, labels)] = value
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        """
+        Record the duration of the block as `voxi_stage_seconds{stage}`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(
+                "voxi_stage_seconds",
+                time.perf_counter() - start,
+                stage=stage,
+                **labels,
+            )
+
+    def quantiles(self, name: str, **labels) -> Dict[float, float]:
+        return _quantiles(self._samples.get(_key(name, labels), ()))
+
+    def export(self) -> str:
+        lines = []
+        for (name, labels), value in sorted(self._counters.items()):
+            lines.append(f"{name}{_fmt(labels)} {value}")
+        for (name, labels), value in sorted(self._gauges.items()):
+            lines.append(f"{name}{_fmt(labels)} {value}")
+        for (name, labels), samples in sorted(self._samples.items()):
+            for q, value in _quantiles(samples).items():
+                lines.append(f"{name}{_fmt(labels, quantile=q)} {value}")
+            count, total = self._totals[(name, labels)]
+            lines.append(f"{name}_count{_fmt(labels)} {count}")
+            lines.append(f"{name}_sum{_fmt(labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
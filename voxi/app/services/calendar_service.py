@@ -1,80 +1,376 @@
-import os
-import requests
-from dotenv import load_dotenv
-from datetime import datetime, date
-from typing import Dict, Any
+import asyncio
+import heapq
+import logging
+import random
+import httpx
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from fastapi import Request
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+from app.core.config import get_settings, Settings
+from app.core.deadline import remaining
+from app.core.metrics import metrics
+from app.services.circuit_breaker import (
+    cal_breaker,
+    CircuitOpenError,
+    STATES,
+)
+from app.services.slot_cache import slot_cache
 
-load_dotenv()
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
-# Configuration from environment
-CAL_API_BASE_URL = os.getenv("CAL_API_BASE_URL")
-CAL_BOOKING_BASE_URL = os.getenv("CAL_BOOKING_BASE_URL")
-DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE")
-DEFAULT_EVENT_SLUG = "30min"
-CAL_API_VERSION = os.getenv("CAL_API_VERSION")
-CAL_API_KEY = os.getenv("CAL_API_KEY")
-CAL_USERNAME = os.getenv("CAL_USERNAME")
+logger = logging.getLogger(__name__)
 
-# Validate critical variables
-if not CAL_API_KEY:
-    raise ValueError("CAL_API_KEY is not set in the environment variables")
-if not CAL_USERNAME:
-    raise ValueError("CAL_USERNAME is not set in the environment variables")
+# Range lookups (/availability?from=&to=)
+DEFAULT_RANGE_DAYS = 7
+MAX_RANGE_DAYS = 31
 
+# Slot lookups send a second (hedged) GET when the first has not
+# answered after SLOT_HEDGE_AFTER seconds, retry failed GETs with
+# jittered exponential backoff, and serve the last slots seen (up to
+# STALE_SLOTS_MAX_AGE old) when Cal.com cannot be reached; see Settings.
+# Attempts with less time left than this are not started
+MIN_UPSTREAM_TIMEOUT = 0.2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-def check_calendar_availability(
-    date_str: str,
-    event_type_slug: str = DEFAULT_EVENT_SLUG,
-    timezone: str = DEFAULT_TIMEZONE,
-    timeout: float = 10.0,
-) -> Dict[str, Any]:
+
+def create_cal_client(
+    settings: Settings,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    Build the async Cal.com client. Connections are kept alive and reused
+    by every request (over HTTP/2 when the h2 package is installed), so a
+    lookup does not pay for a new TCP/TLS handshake. `transport` replaces
+    the network, e.g. with the in-process fake used by the benchmarks.
+    """
+    return httpx.AsyncClient(
+        base_url=settings.cal_api_base_url,
+        headers={
+            "Authorization": f"Bearer {settings.cal_api_key}",
+            "cal-api-version": settings.cal_api_version,
+            "Accept": "application/json",
+        },
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.cal_max_connections,
+            max_keepalive_connections=settings.cal_max_keepalive,
+            keepalive_expiry=settings.cal_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.cal_timeout),
+        transport=transport,
+    )
+
+
+def get_cal_client(request: Request) -> httpx.AsyncClient:
+    """
+    FastAPI dependency returning the client opened by the app lifespan.
     """
-    Fetch available time slots for a given date from Cal.com API (v2).
+    return request.app.state.cal_client
+
+
+def _parse_query_date(date_str: str):
+    """
+    Return (date, None) for a valid, non-past YYYY-MM-DD string, or
+    (None, error dict) otherwise.
     """
     try:
         parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         if parsed_date < date.today():
-            return {
+            return None, {
                 "error":
                 "invalid_date", "message": "Cannot query past dates"
                 }
-    except ValueError:
-        return {
+    except (TypeError, ValueError):
+        return None, {
             "error":
             "invalid_date_format", "message": "Date must be YYYY-MM-DD"
             }
+    return parsed_date, None
+
+
+async def check_calendar_availability(
+    client: httpx.AsyncClient,
+    date_str: str,
+    event_type_slug: Optional[str] = None,
+    timezone: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    hosts: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch available time slots for a given date from Cal.com API (v2),
+    merged across `hosts` (default: every configured host); each slot
+    lists the hosts free at that time.
+    """
+    settings = settings or get_settings()
+    event_type_slug = event_type_slug or settings.default_event_slug
+    timezone = timezone or settings.default_timezone
+    _, error = _parse_query_date(date_str)
+    if error:
+        return error
+
+    result = await _cached_team_slots(
+        client,
+        date_str,
+        date_str,
+        event_type_slug,
+        timezone,
+        settings,
+        hosts or settings.hosts,
+    )
+    if result.get("status") != "success":
+        return result
+
+    return {
+        "status": "success",
+        "date": date_str,
+        "slots": result["slots"],
+        "timezone": timezone,
+        "stale": result["stale"],
+        "hosts": result["hosts"],
+        "failed_hosts": result["failed_hosts"],
+    }
+
+
+async def check_calendar_range(
+    client: httpx.AsyncClient,
+    start_str: str,
+    end_str: Optional[str] = None,
+    event_type_slug: Optional[str] = None,
+    timezone: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    hosts: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch the slots of every day from `start_str` to `end_str` (inclusive,
+    default a week) in a single Cal.com request per host, split per day.
+    """
+    settings = settings or get_settings()
+    event_type_slug = event_type_slug or settings.default_event_slug
+    timezone = timezone or settings.default_timezone
+    start_date, error = _parse_query_date(start_str)
+    if error:
+        return error
+    if end_str is None:
+        end_date = start_date + timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    else:
+        end_date, error = _parse_query_date(end_str)
+        if error:
+            return error
+    if end_date < start_date:
+        return {"error": "invalid_range", "message": "'to' is before 'from'"}
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        return {
+            "error": "invalid_range",
+            "message": f"Ranges are limited to {MAX_RANGE_DAYS} days",
+        }
+
+    result = await _cached_team_slots(
+        client,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        event_type_slug,
+        timezone,
+        settings,
+        hosts or settings.hosts,
+    )
+    if result.get("status") != "success":
+        return result
 
-    if not CAL_API_KEY or not CAL_USERNAME:
+    # Cal.com only returns days that have slots; list every day
+    slots = result["slots"]
+    days = {}
+    day = start_date
+    while day <= end_date:
+        days[day.isoformat()] = slots.get(day.isoformat(), [])
+        day += timedelta(days=1)
+
+    return {
+        "status": "success",
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "days": days,
+        "timezone": timezone,
+        "stale": result["stale"],
+        "hosts": result["hosts"],
+        "failed_hosts": result["failed_hosts"],
+    }
+
+
+def slot_start(slot: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Start of a Cal.com slot as an aware datetime, or None if unparseable.
+    """
+    # Cal.com v2 uses "time"; newer API versions use "start"
+    value = slot.get("time") or slot.get("start")
+    if not isinstance(value, str):
+        return None
+    try:
+        start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=dt_timezone.utc)
+    return start
+
+
+def first_available_slots(
+    days: Dict[str, List[Dict[str, Any]]],
+    after: datetime,
+    limit: int,
+) -> List[datetime]:
+    """
+    The first `limit` slot starts strictly after `after` (aware), in order.
+    """
+    found = []
+    for day in sorted(days):
+        starts = sorted(
+            start for start in map(slot_start, days[day])
+            if start is not None and start > after
+        )
+        found.extend(starts[:limit - len(found)])
+        if len(found) >= limit:
+            break
+    return found
+
+
+def merge_host_slots(
+    host_slots: Dict[str, Dict[str, List[Dict[str, Any]]]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merge the slots of several hosts (host -> date -> slots) into one
+    time-ordered list per date. Slots starting at the same instant become
+    one slot whose "hosts" lists everyone free then, in `host_slots` order.
+    """
+    streams: Dict[str, List[List[Tuple[datetime, int, str, Dict]]]] = (
+        defaultdict(list)
+    )
+    for rank, (host, days) in enumerate(host_slots.items()):
+        for day, slots in days.items():
+            stream = [
+                (start, rank, host, slot)
+                for slot, start in zip(slots, map(slot_start, slots))
+                if start is not None
+            ]
+            # Cal.com returns slots in order; this is a cheap safeguard
+            stream.sort(key=itemgetter(0))
+            streams[day].append(stream)
+
+    merged = {}
+    for day in sorted(streams):
+        # k-way merge: O(n log k) for n slots of k hosts
+        ordered = heapq.merge(*streams[day], key=itemgetter(0, 1))
+        merged[day] = []
+        for _, group in groupby(ordered, key=itemgetter(0)):
+            group = list(group)
+            hosts = list(dict.fromkeys(item[2] for item in group))
+            merged[day].append({**group[0][3], "hosts": hosts})
+    return merged
+
+
+async def _cached_team_slots(
+    client: httpx.AsyncClient,
+    start_str: str,
+    end_str: str,
+    event_type_slug: str,
+    timezone: str,
+    settings: Settings,
+    hosts: List[str],
+) -> Dict[str, Any]:
+    """
+    Slots of every host, fetched concurrently (each through the slot
+    cache) and merged. Cal.com's multi-user list is not used: it returns
+    the times when all of the users are free, not who is free when. Fails
+    only when no host could be fetched.
+    """
+    if not hosts:
+        return {"error": "config_error", "message": "Missing API credentials"}
+
+    results = await asyncio.gather(*(
+        _cached_slots(client, start_str, end_str, event_type_slug,
+                      timezone, settings, host)
+        for host in hosts
+    ))
+    fetched = {
+        host: result for host, result in zip(hosts, results)
+        if result.get("status") == "success"
+    }
+    if not fetched:
+        return results[0]
+
+    return {
+        "status": "success",
+        "slots": merge_host_slots(
+            {host: result["slots"] for host, result in fetched.items()}
+        ),
+        "stale": any(result.get("stale") for result in fetched.values()),
+        "hosts": list(fetched),
+        "failed_hosts": [host for host in hosts if host not in fetched],
+    }
+
+
+async def _cached_slots(
+    client: httpx.AsyncClient,
+    start_str: str,
+    end_str: str,
+    event_type_slug: str,
+    timezone: str,
+    settings: Settings,
+    username: str,
+) -> Dict[str, Any]:
+    if not settings.cal_api_key or not username:
         return {"error": "config_error", "message": "Missing API credentials"}
 
+    key = (start_str, end_str, event_type_slug, timezone, username)
+    # Concurrent callers asking for the same days share one upstream call
+    result = await slot_cache.get_or_fetch(
+        key,
+        lambda: _fetch_slots(client, start_str, end_str, event_type_slug,
+                             timezone, settings, username),
+        cacheable=lambda result: result.get("status") == "success",
+    )
+
+    if result.get("error") == "request_failed" and settings.serve_stale_slots:
+        stale = slot_cache.get_stale(key, settings.stale_slots_max_age)
+        if stale is not None:
+            metrics.increment("stale_slots_served_total")
+            return {**stale, "stale": True}
+    return result
+
+
+async def _fetch_slots(
+    client: httpx.AsyncClient,
+    start_str: str,
+    end_str: str,
+    event_type_slug: str,
+    timezone: str,
+    settings: Settings,
+    username: str,
+) -> Dict[str, Any]:
     # V2 Endpoint uses /v2/slots/available
-    url = f"{CAL_API_BASE_URL}/v2/slots/available"
+    url = "/v2/slots/available"
 
     # V2 uses 'startTime' and 'endTime' instead of 'start' and 'end'
     params = {
-        "usernameList[]": [CAL_USERNAME],  # v2 accepts a list of usernames
+        # v2 accepts a list of usernames
+        "usernameList[]": [username],
         "eventTypeSlug": event_type_slug,
-        "startTime": f"{date_str}T00:00:00Z",
-        "endTime": f"{date_str}T23:59:59Z",
+        "startTime": f"{start_str}T00:00:00Z",
+        "endTime": f"{end_str}T23:59:59Z",
         "timeZone": timezone,
     }
 
-    headers = {
-        "Authorization": f"Bearer {CAL_API_KEY}",
-        "cal-api-version": CAL_API_VERSION,
-        "Accept": "application/json",
-    }
-
     try:
-        response = requests.get(
-            url,
-            params=params,
-            headers=headers,
-            timeout=timeout
-        )
-
-        print(f"CAL.COM STATUS: {response.status_code}")
+        response = await _get_with_retries(client, url, params, settings)
 
         # Check for unauthorized errors early
         if response.status_code == 401:
@@ -84,27 +380,34 @@ def check_calendar_availability(
                 }
 
         response.raise_for_status()
-        data = response.json()
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            # Labelled JSON but malformed; other non-JSON bodies already
+            # failed in _upstream
+            cal_breaker.record_failure()
+            return {
+                "error": "request_failed",
+                "message": "Cal.com answered with a malformed JSON body",
+                "status_code": response.status_code,
+            }
 
         # Handle the v2 response structure
         if data.get("status") == "success":
             slots_data = data.get("data", {})
             # v2 slots are usually nested under data['slots']
-            available_slots = slots_data.get("slots", [])
+            available_slots = slots_data.get("slots", {})
 
-            return {
-                "status": "success",
-                "date": date_str,
-                "slots": available_slots,
-                "timezone": timezone,
-            }
+            return {"status": "success", "slots": available_slots}
 
         return {"status": "api_error", "data": data}
 
-    except requests.RequestException as ex:
+    except httpx.HTTPError as ex:
         status_code = None
-        if hasattr(ex, "response") and ex.response:
-            status_code = getattr(ex.response, "status_code", None)
+        if isinstance(ex, httpx.HTTPStatusError):
+            status_code = ex.response.status_code
 
         return {
             "error": "request_failed",
@@ -113,15 +416,292 @@ def check_calendar_availability(
         }
 
 
+async def refresh_availability(
+    client: httpx.AsyncClient,
+    start_date: date,
+    days: int,
+    event_type_slug: Optional[str] = None,
+    timezone: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    username: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch `days` days of one host's slots from `start_date` in one
+    request, bypassing the cache, and store the range and every single
+    day in the slot cache.
+    """
+    settings = settings or get_settings()
+    event_type_slug = event_type_slug or settings.default_event_slug
+    timezone = timezone or settings.default_timezone
+    username = username or settings.cal_username
+    end_date = start_date + timedelta(days=days - 1)
+    start_str, end_str = start_date.isoformat(), end_date.isoformat()
+
+    # A booking made while the request is in flight wins over its result
+    generation = slot_cache.generation
+    result = await _fetch_slots(
+        client, start_str, end_str, event_type_slug, timezone, settings,
+        username,
+    )
+    if result.get("status") != "success":
+        return result
+
+    slots = result["slots"]
+    slot_cache.set(
+        (start_str, end_str, event_type_slug, timezone, username),
+        result,
+        generation,
+    )
+    day = start_date
+    while day <= end_date:
+        day_str = day.isoformat()
+        slot_cache.set(
+            (day_str, day_str, event_type_slug, timezone, username),
+            {"status": "success", "slots": {day_str: slots.get(day_str, [])}},
+            generation,
+        )
+        day += timedelta(days=1)
+    return result
+
+
+async def create_booking(
+    client: httpx.AsyncClient,
+    payload: Dict[str, Any],
+    idempotency_key: Optional[str] = None,
+    settings: Optional[Settings] = None,
+) -> httpx.Response:
+    """
+    POST a booking to Cal.com; transport errors are raised as httpx.HTTPError.
+    `idempotency_key` is sent as the Idempotency-Key header.
+
+    The POST gets the whole CAL_BOOKING_TIMEOUT, not what is left of the
+    request budget: cancelling it mid-flight could leave a booking that
+    Cal.com created but the caller was told failed. A Vapi retry of the
+    same tool call awaits this request instead of sending another.
+    """
+    settings = settings or get_settings()
+    headers = {}
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
+    return await _upstream(
+        "bookings",
+        lambda budget: client.post(
+            "/v2/bookings", json=payload, headers=headers, timeout=budget
+        ),
+        settings.cal_booking_timeout,
+        settings,
+        budgeted=False,
+    )
+
+
+async def _get_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, Any],
+    settings: Settings,
+) -> httpx.Response:
+    """
+    Hedged GET, retried with full-jitter backoff on transport errors and
+    retryable statuses while the request budget allows. GETs are
+    idempotent, so duplicates are harmless.
+    """
+    timeout = settings.cal_timeout
+
+    def send() -> Awaitable[httpx.Response]:
+        return _upstream(
+            "slots",
+            lambda budget: client.get(url, params=params, timeout=budget),
+            timeout,
+            settings,
+            expect_json=True,
+        )
+
+    outcome: Any = None
+    for attempt in range(settings.slot_retries + 1):
+        if attempt:
+            backoff = settings.slot_retry_backoff * 2 ** attempt
+            delay = random.uniform(0, backoff)
+            if remaining(timeout) - delay < MIN_UPSTREAM_TIMEOUT:
+                break
+            metrics.increment("cal_retries_total", endpoint="slots")
+            await asyncio.sleep(delay)
+        try:
+            response = await _hedged(send, timeout, settings.slot_hedge_after)
+        except CircuitOpenError:
+            raise
+        except httpx.TransportError as ex:
+            outcome = ex
+            continue
+        if response.status_code not in RETRY_STATUSES:
+            return response
+        outcome = response
+
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+async def _hedged(
+    send: Callable[[], Awaitable[httpx.Response]],
+    timeout: float,
+    hedge_after: float,
+) -> httpx.Response:
+    """
+    Await `send()`; if it has not answered within `hedge_after` and the
+    budget allows, race it against a second identical request.
+    """
+    first = asyncio.ensure_future(send())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done or remaining(timeout) < MIN_UPSTREAM_TIMEOUT:
+            return await first
+
+        metrics.increment("cal_hedged_requests_total", endpoint="slots")
+        tasks.append(asyncio.ensure_future(send()))
+        error: Optional[Exception] = None
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done
+            except httpx.TransportError as ex:
+                error = ex
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _upstream(
+    endpoint: str,
+    send: Callable[[float], Awaitable[httpx.Response]],
+    timeout: float,
+    settings: Settings,
+    expect_json: bool = False,
+    budgeted: bool = True,
+) -> httpx.Response:
+    """
+    Call `send(budget)` through the circuit breaker, with the timeout cut
+    to what is left of the request budget (unless `budgeted` is False),
+    recording latency and status. With `expect_json`, a 2xx response that
+    is not JSON (e.g. a proxy's HTML error page) counts as a failure and
+    raises httpx.DecodingError.
+    """
+    budget = remaining(timeout) if budgeted else timeout
+    if budget < MIN_UPSTREAM_TIMEOUT:
+        raise httpx.TimeoutException("Request budget exhausted")
+    if not cal_breaker.allow():
+        metrics.increment(
+            "cal_upstream_responses_total",
+            endpoint=endpoint,
+            status="circuit_open",
+        )
+        raise CircuitOpenError("Cal.com circuit breaker is open")
+
+    try:
+        with metrics.timer("upstream", endpoint=endpoint):
+            try:
+                # httpx timeouts apply per read, not to the whole call
+                response = await asyncio.wait_for(send(budget), budget)
+            except asyncio.TimeoutError:
+                raise httpx.TimeoutException(
+                    f"No response within {budget:.2f}s"
+                ) from None
+    except httpx.HTTPError as ex:
+        # Timeouts much shorter than usual say more about our budget than
+        # about Cal.com and do not count towards opening the breaker
+        if (
+            isinstance(ex, httpx.TimeoutException)
+            and budget < settings.breaker_min_timeout
+        ):
+            cal_breaker.release()
+        else:
+            cal_breaker.record_failure()
+        metrics.increment(
+            "cal_upstream_responses_total", endpoint=endpoint, status="error"
+        )
+        logger.warning(
+            "Cal.com request failed",
+            extra={"fields": {"endpoint": endpoint, "error": repr(ex)}},
+        )
+        raise
+    except BaseException:
+        # Cancelled, e.g. the losing request of a hedged pair
+        cal_breaker.release()
+        raise
+
+    not_json = (
+        expect_json
+        and response.is_success
+        and "json" not in response.headers.get("content-type", "")
+    )
+    if response.status_code in RETRY_STATUSES or not_json:
+        cal_breaker.record_failure()
+    else:
+        cal_breaker.record_success()
+    metrics.increment(
+        "cal_upstream_responses_total",
+        endpoint=endpoint,
+        status="not_json" if not_json else response.status_code,
+    )
+    if not_json:
+        raise httpx.DecodingError(
+            "Cal.com answered with a non-JSON body",
+            request=response.request,
+        )
+    logger.debug(
+        "Cal.com response",
+        extra={"fields": {
+            "endpoint": endpoint, "status": response.status_code
+        }},
+    )
+    return response
+
+
+def breaker_state() -> Dict[str, Any]:
+    """
+    Circuit breaker state for /status and /metrics.
+    """
+    stats = cal_breaker.stats()
+    stats["state_code"] = STATES.index(stats["state"])
+    return stats
+
+
+def invalidate_availability(
+    start: str, settings: Optional[Settings] = None
+) -> None:
+    """
+    Forget cached slots for the day(s) a booking starting at `start` falls
+    on, in UTC and in the default timezone. Unparseable times clear all.
+    """
+    try:
+        start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+    except ValueError:
+        slot_cache.clear()
+        return
+
+    timezone = (settings or get_settings()).default_timezone
+    dates = {start_dt.date()}
+    if start_dt.tzinfo is not None:
+        dates.add(start_dt.astimezone(ZoneInfo(timezone)).date())
+    for day in dates:
+        slot_cache.invalidate_date(day.isoformat())
+
+
 def get_cal_com_booking_link(
     date_str: str,
-    event_type_slug: str = DEFAULT_EVENT_SLUG,
-    username: str = CAL_USERNAME
+    event_type_slug: Optional[str] = None,
+    username: Optional[str] = None,
+    settings: Optional[Settings] = None,
 ) -> str:
     """
     Generate a direct link to the Cal.com booking page.
     """
-    base_url = f"{CAL_BOOKING_BASE_URL}/{username}/{event_type_slug}"
+    settings = settings or get_settings()
+    event_type_slug = event_type_slug or settings.default_event_slug
+    username = username or settings.cal_username
+    base_url = (
+        f"{settings.cal_booking_base_url}/{username}/{event_type_slug}"
+    )
     query_string = urlencode({"date": date_str})
 
     return f"{base_url}?{query_string}"
@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+)
+from app.core.metrics import metrics
+
+
+def idempotency_key(*parts: Any) -> str:
+    """
+    Stable key for a request, identical across retries and processes.
+    """
+    joined = "|".join(str(part) for part in parts)
+    return hashlib.sha256(joined.encode()).hexdigest()[:32]
+
+
+class IdempotencyStore:
+    """
+    Runs an operation at most once per key while its result is retained.
+
+    A request is known by several keys (e.g. the Vapi toolCallId and the
+    attendee + start time); a match on any of them counts. Duplicates
+    arriving while the first request is in flight await its result, and
+    completed results accepted by `replayable` are replayed for `ttl`
+    seconds from a store bounded to `maxsize` entries.
+    """
+
+    def __init__(self, ttl: float = 900.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def _stored(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        entry = self._results.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._results[key]
+            return None
+        return entry
+
+    def _store(self, keys: Iterable[Hashable], value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl
+        for key in keys:
+            self._results[key] = (expires_at, value)
+            self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    async def run(
+        self,
+        keys: Iterable[Hashable],
+        operation: Callable[[], Awaitable[Any]],
+        replayable: Callable[[Any], bool] = lambda result: True,
+    ) -> Any:
+        keys = [key for key in keys if key is not None]
+
+        for key in keys:
+            entry = self._stored(key)
+            if entry is not None:
+                metrics.increment("idempotent_replays_total", source="stored")
+                return entry[1]
+
+        for key in keys:
+            task = self._inflight.get(key)
+            if task is not None:
+                metrics.increment(
+                    "idempotent_replays_total", source="inflight"
+                )
+                return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(operation())
+        for key in keys:
+            self._inflight[key] = task
+
+        def done(task: asyncio.Task) -> None:
+            for key in keys:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+            if (
+                not task.cancelled()
+                and task.exception() is None
+                and replayable(task.result())
+            ):
+                self._store(keys, task.result())
+
+        task.add_done_callback(done)
+        # A retry that gives up must not cancel the booking itself
+        return await asyncio.shield(task)
+
+
+booking_store = IdempotencyStore()
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+import httpx
+from app.core.config import Settings
+from app.services.calendar_service import refresh_availability
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityPrefetcher:
+    """
+    Background task that keeps the next `days` days of availability in
+    the slot cache, so the first question of a call is not a cache miss.
+
+    Each round makes one range request per event type and host. Rounds
+    repeat every `interval` seconds (+/- `jitter` as a fraction, so
+    workers do not refresh in lockstep) and back off exponentially while
+    Cal.com keeps failing.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        settings: Settings,
+        days: int = 7,
+        interval: float = 20.0,
+        jitter: float = 0.1,
+        max_backoff: float = 300.0,
+        event_slugs: Optional[List[str]] = None,
+    ):
+        self.client = client
+        self.settings = settings
+        self.days = days
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.event_slugs = event_slugs or [settings.default_event_slug]
+        self.timezone = settings.default_timezone
+        self.failures = 0
+        self.rounds = 0
+        self.last_success: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(
+        cls, client: httpx.AsyncClient, settings: Settings
+    ) -> "AvailabilityPrefetcher":
+        return cls(
+            client,
+            settings,
+            days=settings.prefetch_days,
+            interval=settings.prefetch_interval,
+            jitter=settings.prefetch_jitter,
+            max_backoff=settings.prefetch_max_backoff,
+            event_slugs=settings.prefetch_event_slugs,
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh_once(self) -> bool:
+        """
+        Refresh every event type of every host; True when all succeeded.
+        """
+        start = time.monotonic()
+        today = datetime.now(ZoneInfo(self.timezone)).date()
+        results = await asyncio.gather(
+            *(
+                refresh_availability(
+                    self.client,
+                    today,
+                    self.days,
+                    slug,
+                    self.timezone,
+                    self.settings,
+                    host,
+                )
+                for slug in self.event_slugs
+                for host in self.settings.hosts
+            ),
+            return_exceptions=True,
+        )
+        self.rounds += 1
+        self.last_duration = time.monotonic() - start
+
+        ok = all(
+            isinstance(result, dict) and result.get("status") == "success"
+            for result in results
+        )
+        if ok:
+            self.last_success = time.monotonic()
+        return ok
+
+    def next_delay(self) -> float:
+        delay = self.interval
+        if self.failures:
+            delay = min(self.interval * 2 ** self.failures, self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self) -> None:
+        while True:
+            if await self.refresh_once():
+                self.failures = 0
+            else:
+                self.failures += 1
+                logger.warning(
+                    "Availability prefetch failed",
+                    extra={"fields": {"consecutive_failures": self.failures}},
+                )
+            await asyncio.sleep(self.next_delay())
+
+    def stats(self) -> Dict[str, Any]:
+        lag = None
+        if self.last_success is not None:
+            lag = time.monotonic() - self.last_success
+        return {
+            "running": self._task is not None,
+            "rounds": self.rounds,
+            "consecutive_failures": self.failures,
+            # Seconds since the cache was last refreshed successfully
+            "refresh_lag_seconds": lag,
+            "last_refresh_seconds": self.last_duration,
+        }
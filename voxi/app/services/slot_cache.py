@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+)
+
+
+class SlotCache:
+    """
+    Bounded TTL cache of availability lookups with single-flight misses.
+
+    Keys are (first date, last date, event slug, timezone, username)
+    tuples. Concurrent misses for the same key share one upstream request;
+    invalidating a date drops every entry whose range covers it, including
+    lookups still in flight.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Bumped on invalidation so late results are not stored
+        self._generation = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        # Expired entries stay (until evicted) as a stale fallback
+        if time.monotonic() - stored_at >= self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_stale(self, key: Hashable, max_age: float) -> Any:
+        """
+        The last stored value for `key`, expired or not, if it is at most
+        `max_age` seconds old.
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        return entry[1]
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key: Hashable, value: Any,
+            generation: Optional[int] = None) -> None:
+        """
+        Store `value`; with `generation`, only if nothing was invalidated
+        since that generation was read.
+        """
+        if self.ttl <= 0:
+            return
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """
+        Return the cached value for `key`, or await `fetch()` once for all
+        concurrent callers. Only results passing `cacheable` are stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            generation = self._generation
+
+            def done(task: asyncio.Task) -> None:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                if (
+                    not task.cancelled()
+                    and task.exception() is None
+                    and cacheable(task.result())
+                ):
+                    self.set(key, task.result(), generation)
+
+            task.add_done_callback(done)
+
+        # A cancelled caller must not cancel the lookup others wait on
+        return await asyncio.shield(task)
+
+    def invalidate_date(self, date_str: str) -> None:
+        """
+        Drop every entry and in-flight lookup covering `date_str`.
+        """
+        # ISO dates compare correctly as strings
+        self._generation += 1
+        for key in [k for k in self._entries if k[0] <= date_str <= k[1]]:
+            del self._entries[key]
+        for key in [k for k in self._inflight if k[0] <= date_str <= k[1]]:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+
+
+slot_cache = SlotCache()
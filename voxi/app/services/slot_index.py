@@ -0,0 +1,172 @@
+import re
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from app.services.calendar_service import slot_start
+
+# "3", "3 pm", "3:30 p.m.", "15:30", "15:30:00", "3 o'clock"
+SPOKEN_TIME = re.compile(
+    r"^(\d{1,2})(?:[:.](\d{2})(?::(\d{2}))?)?\s*(?:o'?clock)?\s*"
+    r"(?:([ap])\.?\s*m\.?)?$"
+)
+NAMED_TIMES = {"noon": time(12), "midday": time(12), "midnight": time(0)}
+# Without am/pm, "1" to "7" mean the afternoon during business hours
+LAST_PM_DEFAULT_HOUR = 7
+
+
+def parse_spoken_day(value: Optional[str], tz: ZoneInfo) -> Optional[date]:
+    """
+    "today", "tomorrow" or YYYY-MM-DD, relative to now in `tz`.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower()
+    today = datetime.now(tz).date()
+    if value == "today":
+        return today
+    if value == "tomorrow":
+        return today + timedelta(days=1)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_spoken_time(
+    value: Optional[str], day: Optional[date], tz: ZoneInfo
+) -> Optional[datetime]:
+    """
+    Normalise an ISO timestamp, or a spoken time ("3 pm", "15:30",
+    "noon") on `day`, to an aware datetime; naive times are taken in the
+    caller's timezone `tz`. None when it cannot be understood. An hour
+    said without am/pm is read as in spoken_time_candidates.
+    """
+    candidates = spoken_time_candidates(value, day, tz)
+    return candidates[0] if candidates else None
+
+
+def spoken_time_candidates(
+    value: Optional[str], day: Optional[date], tz: ZoneInfo
+) -> List[datetime]:
+    """
+    The readings of `value` as in parse_spoken_time, most likely first:
+    one, or for an hour from 1 to 11 said without am/pm ("3", "3:30",
+    "9 o'clock") both halves of the day. 1 to 7 default to pm, 8 to 11
+    to am; a leading zero ("09:00") is taken as 24-hour time.
+    """
+    if not isinstance(value, str):
+        return []
+    value = value.strip()
+
+    # ISO timestamps carry their own date
+    if len(value) > 10 and value[:4].isdigit() and value[4] == "-":
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return []
+        if parsed.tzinfo is None:
+            return [parsed.replace(tzinfo=tz)]
+        return [parsed.astimezone(tz)]
+
+    if day is None:
+        return []
+    spoken = value.lower()
+    if spoken in NAMED_TIMES:
+        return [datetime.combine(day, NAMED_TIMES[spoken], tz)]
+
+    match = SPOKEN_TIME.match(spoken)
+    if not match:
+        return []
+    hour_text, minute, second, meridiem = match.groups()
+    hour, minute, second = int(hour_text), int(minute or 0), int(second or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return []
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return []
+    when = datetime.combine(day, time(hour, minute, second), tz)
+
+    if meridiem or not 1 <= hour <= 11 or hour_text.startswith("0"):
+        return [when]
+    afternoon = when.replace(hour=hour + 12)
+    if hour <= LAST_PM_DEFAULT_HOUR:
+        return [afternoon, when]
+    return [when, afternoon]
+
+
+class SlotIndex:
+    """
+    Available slot starts per date, sorted once so a requested time is
+    matched by binary search instead of a scan per lookup.
+
+    Built from the `slots` of a Cal.com availability result (date ->
+    list of slots); dates are those of the timezone the slots were
+    fetched in.
+    """
+
+    def __init__(self, slots: Dict[str, List[Dict[str, Any]]]):
+        self._starts: Dict[str, List[datetime]] = {}
+        self._hosts: Dict[datetime, List[str]] = {}
+        for day, day_slots in slots.items():
+            starts = []
+            for slot in day_slots:
+                start = slot_start(slot)
+                if start is not None:
+                    starts.append(start)
+                    self._hosts[start] = slot.get("hosts", [])
+            self._starts[day] = sorted(starts)
+
+    def starts(self, day: str) -> List[datetime]:
+        return self._starts.get(day, [])
+
+    def hosts(self, start: datetime) -> List[str]:
+        """
+        Hosts free at slot `start`, as annotated by the merged slots.
+        """
+        return self._hosts.get(start, [])
+
+    def choose(self, candidates: List[datetime]) -> datetime:
+        """
+        The reading of an ambiguous time to book: the first candidate that
+        is a slot, else the first whose half of the day has slots, else
+        the first. Candidates are aware and in the slots' timezone.
+        """
+        for when in candidates:
+            if self.match(when, alternatives=0)[0] is not None:
+                return when
+        for when in candidates:
+            if any(
+                (start.astimezone(when.tzinfo).hour < 12) == (when.hour < 12)
+                for start in self.starts(when.date().isoformat())
+            ):
+                return when
+        return candidates[0]
+
+    def match(
+        self, when: datetime, alternatives: int = 2
+    ) -> Tuple[Optional[datetime], List[datetime]]:
+        """
+        (slot starting exactly at `when`, []) if there is one, otherwise
+        (None, the `alternatives` starts on the same day nearest to it,
+        in time order). `when` must be aware and in the slots' timezone.
+        """
+        starts = self.starts(when.date().isoformat())
+        i = bisect_left(starts, when)
+        if i < len(starts) and starts[i] == when:
+            return starts[i], []
+
+        # Walk outwards from the insertion point, nearest first
+        nearest = []
+        lo, hi = i - 1, i
+        while len(nearest) < alternatives and (lo >= 0 or hi < len(starts)):
+            if hi >= len(starts) or (
+                lo >= 0 and when - starts[lo] <= starts[hi] - when
+            ):
+                nearest.append(starts[lo])
+                lo -= 1
+            else:
+                nearest.append(starts[hi])
+                hi += 1
+        return None, sorted(nearest)
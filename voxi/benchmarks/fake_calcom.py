@@ -0,0 +1,160 @@
+"""
+In-process stand-in for the Cal.com v2 API with configurable latency,
+error rate and slot fixtures. It serves GET /v2/slots/available and
+POST /v2/bookings, honours Idempotency-Key and hides booked slots.
+
+Use it in-process through `httpx.ASGITransport(FakeCalCom().app)`, or
+run it as a server and point CAL_API_BASE_URL at it:
+    python -m benchmarks.fake_calcom --port 8001 --latency-ms 80
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class FakeCalCom:
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        day_start: int = 9,
+        day_end: int = 17,
+        slot_minutes: int = 30,
+        fixtures: Optional[Dict[str, List[str]]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        `fixtures` maps YYYY-MM-DD to ISO slot start times and replaces
+        the generated day_start..day_end grid for those dates.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.day_start = day_start
+        self.day_end = day_end
+        self.slot_minutes = slot_minutes
+        self.fixtures = fixtures or {}
+        self.random = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.booked: set = set()
+        self.bookings: Dict[str, dict] = {}
+
+        self.app = FastAPI(title="Fake Cal.com")
+        self.app.add_api_route(
+            "/v2/slots/available", self.slots, methods=["GET"]
+        )
+        self.app.add_api_route("/v2/bookings", self.book, methods=["POST"])
+
+    async def _simulate(self, endpoint: str) -> Optional[JSONResponse]:
+        """
+        Sleep for the configured latency; return an error response for
+        the configured share of requests.
+        """
+        self.requests[endpoint] += 1
+        delay = self.random.gauss(self.latency, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+        if self.random.random() < self.error_rate:
+            self.requests[f"{endpoint}_errors"] += 1
+            return JSONResponse(
+                {"status": "error", "message": "injected failure"},
+                status_code=self.error_status,
+            )
+        return None
+
+    def day_slots(self, day: date, timezone: str) -> List[str]:
+        day_str = day.isoformat()
+        if day_str in self.fixtures:
+            starts = self.fixtures[day_str]
+        else:
+            tz = ZoneInfo(timezone)
+            start = datetime.combine(day, time(self.day_start), tz)
+            end = datetime.combine(day, time(self.day_end), tz)
+            step = timedelta(minutes=self.slot_minutes)
+            starts = []
+            while start < end:
+                starts.append(start.isoformat())
+                start += step
+        return [
+            start for start in starts
+            if datetime.fromisoformat(start) not in self.booked
+        ]
+
+    async def slots(self, request: Request):
+        error = await self._simulate("slots")
+        if error is not None:
+            return error
+
+        params = request.query_params
+        timezone = params.get("timeZone") or "UTC"
+        first = date.fromisoformat(params["startTime"][:10])
+        last = date.fromisoformat(params["endTime"][:10])
+        slots = {}
+        day = first
+        while day <= last:
+            starts = self.day_slots(day, timezone)
+            if starts:
+                slots[day.isoformat()] = [{"time": s} for s in starts]
+            day += timedelta(days=1)
+        return {"status": "success", "data": {"slots": slots}}
+
+    async def book(self, request: Request):
+        error = await self._simulate("bookings")
+        if error is not None:
+            return error
+
+        key = request.headers.get("Idempotency-Key")
+        if key and key in self.bookings:
+            return JSONResponse(self.bookings[key], status_code=201)
+
+        payload = await request.json()
+        start = payload["start"].replace("Z", "+00:00")
+        # Aware datetimes compare by instant, whatever the offset
+        self.booked.add(datetime.fromisoformat(start))
+        body = {
+            "status": "success",
+            "data": {"id": len(self.bookings) + 1, "start": payload["start"]},
+        }
+        if key:
+            self.bookings[key] = body
+        return JSONResponse(body, status_code=201)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--fixtures", help="JSON file: date -> [ISO times]")
+    args = parser.parse_args()
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures) as f:
+            fixtures = json.load(f)
+
+    import uvicorn
+    fake = FakeCalCom(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        fixtures=fixtures,
+    )
+    uvicorn.run(fake.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
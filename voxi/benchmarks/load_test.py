@@ -0,0 +1,232 @@
+"""
+Drive the voxi endpoints concurrently against the fake Cal.com and
+report throughput, p50/p99 latency and errors per endpoint.
+
+voxi answers upstream failures with 200 and an apology for the caller,
+so a request counts as an error from its body: a Vapi tool result that
+apologises, or an /availability/{date} lookup whose status is not
+"success". Bookings refused because the slot was already taken are
+reported as rejected instead.
+
+The app and the fake run in this process over ASGI transports, so the
+numbers measure voxi itself (caching, coalescing, pooling) plus the
+simulated upstream latency, without network noise.
+
+Usage (from the voxi directory):
+    python -m benchmarks.load_test --requests 1000 --concurrency 50 \\
+        --latency-ms 80 --error-rate 0.02 --output results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+import httpx
+import main as voxi
+from app.core.config import get_settings, Settings
+from benchmarks.fake_calcom import FakeCalCom
+
+SCENARIOS = ("check_availability", "book_appointment", "availability_date")
+
+# How voxi's tool results begin when the call did not succeed
+APOLOGIES = ("Sorry", "It looks like there was a technical issue")
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_request(scenario: str, n: int, day: str, timezone: str):
+    """
+    (method, path, json body) for the n-th request of a scenario.
+    """
+    call = {"id": f"call-{n}", "function": {"arguments": {"date": day}}}
+    if scenario == "check_availability":
+        body = {"message": {"toolCalls": [call]}}
+        return "POST", "/vapi/check-availability", body
+    if scenario == "book_appointment":
+        # Half-hour grid from 09:00 so most starts exist in the fake
+        minutes = 9 * 60 + 30 * (n % 16)
+        call["function"]["arguments"] = {
+            "name": f"Caller {n}",
+            "email": f"caller{n}@example.com",
+            "time": f"{day}T{minutes // 60:02d}:{minutes % 60:02d}:00"
+                    f"{timezone}",
+        }
+        body = {"message": {"toolCalls": [call]}}
+        return "POST", "/vapi/book-appointment", body
+    return "GET", f"/availability/{day}", None
+
+
+def outcome(scenario: str, response: httpx.Response) -> str:
+    """
+    "ok", "rejected" (the requested slot was taken) or "error".
+    """
+    if response.status_code >= 400:
+        return "error"
+    try:
+        body = response.json()
+    except ValueError:
+        return "error"
+
+    if scenario == "availability_date":
+        availability = body.get("availability") or {}
+        return "ok" if availability.get("status") == "success" else "error"
+
+    results = body.get("results") or [{}]
+    result = results[0].get("result") or ""
+    if not result.startswith(APOLOGIES):
+        return "ok"
+    if scenario == "book_appointment" and "isn't available" in result:
+        return "rejected"
+    return "error"
+
+
+async def run(args) -> Dict:
+    fake = FakeCalCom(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    # Tuning knobs come from the environment as in production; the
+    # credentials and the upstream are the harness's own
+    settings = Settings.from_env().model_copy(update={
+        "cal_api_key": "benchmark-api-key",
+        "cal_username": "benchmark",
+        "cal_api_base_url": "http://fake-cal",
+        "prefetch_enabled": args.prefetch,
+        "log_level": "WARNING",
+    })
+    voxi.app.dependency_overrides[get_settings] = lambda: settings
+    voxi.app.state.cal_transport = httpx.ASGITransport(app=fake.app)
+
+    first_day = date.today() + timedelta(days=1)
+    days = [
+        (first_day + timedelta(days=i)).isoformat() for i in range(args.days)
+    ]
+    scenarios = [s for s in SCENARIOS if s in args.scenarios]
+    counter = itertools.count()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    rejected: Dict[str, int] = defaultdict(int)
+
+    async def worker(client: httpx.AsyncClient):
+        while True:
+            n = next(counter)
+            if n >= args.requests:
+                return
+            scenario = scenarios[n % len(scenarios)]
+            day = days[(n // len(scenarios)) % len(days)]
+            method, path, body = make_request(
+                scenario, n, day, args.utc_offset
+            )
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                result = outcome(scenario, response)
+            except httpx.HTTPError:
+                result = "error"
+            latencies[scenario].append(time.perf_counter() - started)
+            if result == "error":
+                errors[scenario] += 1
+            elif result == "rejected":
+                rejected[scenario] += 1
+
+    async with voxi.app.router.lifespan_context(voxi.app):
+        transport = httpx.ASGITransport(app=voxi.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://voxi", timeout=30
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(worker(client) for _ in range(args.concurrency))
+            )
+            elapsed = time.perf_counter() - started
+            metrics_text = (await client.get("/metrics")).text
+
+    def summary(
+        values: List[float], error_count: int, rejected_count: int
+    ) -> Dict:
+        return {
+            "requests": len(values),
+            "errors": error_count,
+            "rejected": rejected_count,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(max(values, default=0.0) * 1000, 2),
+        }
+
+    everything = list(itertools.chain.from_iterable(latencies.values()))
+    return {
+        "config": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "results": {
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_rps": round(len(everything) / elapsed, 1),
+            **summary(
+                everything, sum(errors.values()), sum(rejected.values())
+            ),
+            "scenarios": {
+                scenario: summary(
+                    latencies[scenario], errors[scenario], rejected[scenario]
+                )
+                for scenario in scenarios
+            },
+            "upstream_requests": dict(fake.requests),
+            "bookings": len(fake.bookings),
+        },
+        "metrics": metrics_text,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--utc-offset", default="+05:30",
+                        help="offset of the booked start times")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS,
+                        default=list(SCENARIOS))
+    parser.add_argument("--prefetch", action="store_true",
+                        help="run the availability prefetcher")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    results = report["results"]
+    print(
+        f"{results['requests']} requests in {results['elapsed_seconds']}s "
+        f"({results['throughput_rps']} req/s), p50 {results['p50_ms']} ms, "
+        f"p99 {results['p99_ms']} ms, {results['errors']} errors, "
+        f"{results['rejected']} rejected"
+    )
+    for scenario, stats in results["scenarios"].items():
+        print(f"  {scenario:20} p50 {stats['p50_ms']:8} ms  "
+              f"p99 {stats['p99_ms']:8} ms  errors {stats['errors']}  "
+              f"rejected {stats['rejected']}")
+    print(f"  upstream: {results['upstream_requests']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
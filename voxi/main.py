@@ -1,44 +1,230 @@
-from fastapi import FastAPI
+import httpx
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from typing import List, Optional
+from zoneinfo import ZoneInfo
 from app.api import vapi_routes
-from dotenv import load_dotenv
+from app.core.config import get_settings, Settings
+from app.core.deadline import deadline_scope
+from app.core.logs import start_logging, stop_logging
+from app.core.metrics import metrics
 from app.services.calendar_service import (
+    breaker_state,
     check_calendar_availability,
+    check_calendar_range,
+    create_cal_client,
+    first_available_slots,
+    get_cal_client,
     get_cal_com_booking_link,
 )
+from app.services.circuit_breaker import cal_breaker
+from app.services.idempotency import booking_store
+from app.services.prefetch import AvailabilityPrefetcher
+from app.services.slot_cache import slot_cache
 import uvicorn
 
-load_dotenv()
 
-app = FastAPI(title="Voxi AI Receptionist")
+def configure_services(settings: Settings) -> None:
+    """
+    Size the process-wide caches and the circuit breaker from `settings`.
+    """
+    slot_cache.ttl = settings.slot_cache_ttl
+    slot_cache.maxsize = settings.slot_cache_maxsize
+    booking_store.ttl = settings.idempotency_ttl
+    booking_store.maxsize = settings.idempotency_maxsize
+    cal_breaker.failure_threshold = settings.breaker_failure_threshold
+    cal_breaker.reset_timeout = settings.breaker_reset_timeout
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Settings are read here rather than at import; a test override of
+    # the get_settings dependency applies to startup as well
+    settings = app.dependency_overrides.get(get_settings, get_settings)()
+    settings.require_credentials()
+    app.state.settings = settings
+    start_logging(secrets=[settings.cal_api_key], level=settings.log_level)
+    configure_services(settings)
+    # One pooled Cal.com client for the whole process
+    transport = getattr(app.state, "cal_transport", None)
+    async with create_cal_client(settings, transport) as client:
+        app.state.cal_client = client
+        # Keep the next days of availability warm in the slot cache
+        app.state.prefetcher = AvailabilityPrefetcher.from_settings(
+            client, settings
+        )
+        if settings.prefetch_enabled:
+            app.state.prefetcher.start()
+        try:
+            yield
+        finally:
+            await app.state.prefetcher.stop()
+            stop_logging()
+
+
+app = FastAPI(title="Voxi AI Receptionist", lifespan=lifespan)
 
 # Mount Vapi routes
 app.include_router(vapi_routes.router)
 
 
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    # Upstream timeouts are cut to what is left of this budget
+    with deadline_scope(request.app.state.settings.request_budget):
+        response = await call_next(request)
+    # Label by route template so /availability/{date} is one series
+    route = request.scope.get("route")
+    metrics.observe(
+        "http_request_seconds",
+        time.perf_counter() - start,
+        path=getattr(route, "path", "unmatched"),
+        method=request.method,
+    )
+    return response
+
+
 @app.get("/")
 async def root():
     return {"message": "Voxi Server is Live"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def export_metrics():
+    """
+    Prometheus text: p50/p95/p99 per stage and route, Cal.com response
+    status counters, slot cache, prefetch and circuit breaker gauges.
+    """
+    for name, value in slot_cache.stats().items():
+        if value is not None:
+            metrics.set_gauge(f"slot_cache_{name}", value)
+    for name, value in app.state.prefetcher.stats().items():
+        if value is not None:
+            metrics.set_gauge(f"prefetch_{name}", float(value))
+    breaker = breaker_state()
+    # 0 closed, 1 half-open, 2 open
+    metrics.set_gauge("cal_circuit_state", breaker["state_code"])
+    metrics.set_gauge("cal_circuit_trips_total", breaker["trips"])
+    return PlainTextResponse(metrics.export())
+
+
+@app.get("/status", include_in_schema=False)
+async def status():
+    """
+    Slot cache hit rate and prefetch refresh lag of this worker.
+    """
+    return {
+        "slot_cache": slot_cache.stats(),
+        "prefetch": app.state.prefetcher.stats(),
+        "circuit_breaker": breaker_state(),
+    }
+
+
+def _requested_hosts(
+    host: Optional[List[str]], settings: Settings
+) -> List[str]:
+    """
+    The configured hosts named by `host` query parameters, or all.
+    """
+    if not host:
+        return settings.hosts
+    unknown = [name for name in host if name not in settings.hosts]
+    if unknown:
+        raise HTTPException(status_code=400, detail={
+            "error": "invalid_host", "message": f"Unknown host(s): {unknown}"
+        })
+    return host
+
+
 # ────────────────────────────────────────────────
 #     Add this endpoint so /availability/... works
 # ────────────────────────────────────────────────
 
+@app.get("/availability", include_in_schema=False)
+async def availability_range(
+    start: str = Query(alias="from"),
+    end: Optional[str] = Query(default=None, alias="to"),
+    after: Optional[datetime] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=100),
+    host: Optional[List[str]] = Query(default=None),
+    client: httpx.AsyncClient = Depends(get_cal_client),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Available slots for every day from `from` to `to` (default a week),
+    fetched with one upstream request per host and merged. With `limit`,
+    also return the first `limit` slots after `after` (default now).
+
+    Example usage:
+        GET /availability?from=2026-02-11&to=2026-02-17&limit=3
+    """
+    avail = await check_calendar_range(
+        client,
+        start,
+        end,
+        settings=settings,
+        hosts=_requested_hosts(host, settings),
+    )
+    if avail.get("status") != "success":
+        bad_input = avail.get("error", "").startswith("invalid_")
+        raise HTTPException(status_code=400 if bad_input else 502,
+                            detail=avail)
+
+    response = {
+        "from": avail["from"],
+        "to": avail["to"],
+        "timezone": avail["timezone"],
+        "days": avail["days"],
+        "stale": avail["stale"],
+        "hosts": avail["hosts"],
+        "failed_hosts": avail["failed_hosts"],
+    }
+    if limit is not None:
+        tz = ZoneInfo(avail["timezone"])
+        if after is None:
+            after = datetime.now(tz)
+        elif after.tzinfo is None:
+            after = after.replace(tzinfo=tz)
+        response["first_available"] = [
+            start.isoformat()
+            for start in first_available_slots(avail["days"], after, limit)
+        ]
+    return response
+
+
 @app.get("/availability/{date}", include_in_schema=False)
-def availability(date: str):
+async def availability(
+    date: str,
+    host: Optional[List[str]] = Query(default=None),
+    client: httpx.AsyncClient = Depends(get_cal_client),
+    settings: Settings = Depends(get_settings),
+):
     """
-    Return available slots and a direct booking link for a given date.
+    Return the slots of every host (or of the given `host`s) merged in
+    time order, each listing the hosts free then, and direct booking
+    links for a given date.
 
     Example usage:
-        GET /availability/2026-02-11
+        GET /availability/2026-02-11?host=alice&host=bob
     """
-    avail = check_calendar_availability(date)
-    link = get_cal_com_booking_link(date)
+    hosts = _requested_hosts(host, settings)
+    avail = await check_calendar_availability(
+        client, date, settings=settings, hosts=hosts
+    )
+    links = {
+        name: get_cal_com_booking_link(date, username=name, settings=settings)
+        for name in hosts
+    }
 
     return {
         "date": date,
         "availability": avail,
-        "direct_booking_link": link
+        "direct_booking_link": links[hosts[0]],
+        "direct_booking_links": links,
     }
 
 
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # Async tests run through anyio's pytest plugin on asyncio only
+    return "asyncio"
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from app.core.deadline import deadline_scope, remaining
+from app.services.circuit_breaker import (
+    CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+)
+
+
+def wait_out(breaker):
+    # As if reset_timeout had passed since the breaker opened
+    breaker.opened_at -= breaker.reset_timeout
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["trips"] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    wait_out(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    wait_out(breaker)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["trips"] == 2
+
+
+def test_released_probe_frees_the_half_open_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    wait_out(breaker)
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_remaining_without_a_budget_is_the_default():
+    assert remaining(10.0) == 10.0
+
+
+@pytest.mark.anyio
+async def test_deadline_is_shared_with_started_tasks():
+    with deadline_scope(1.0):
+        assert remaining(10.0) <= 1.0
+        # Tasks copy the context, so they see the same deadline
+        inner = await asyncio.ensure_future(
+            asyncio.sleep(0, result=remaining(10.0))
+        )
+        assert inner <= 1.0
+        assert remaining(0.5) == 0.5
+    assert remaining(10.0) == 10.0
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from app.services.idempotency import IdempotencyStore, idempotency_key
+
+pytestmark = pytest.mark.anyio
+
+
+class Booking:
+    """
+    Fake operation: returns (message, accepted) once `release` is set.
+    """
+
+    def __init__(self, accepted=True):
+        self.accepted = accepted
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return f"booking {self.calls}", self.accepted
+
+
+def replayable(result):
+    return result[1]
+
+
+async def test_duplicate_tool_call_waits_then_replays():
+    store = IdempotencyStore()
+    book = Booking()
+    keys = [("call", "tool-1"), ("booking", "abc")]
+
+    first = asyncio.ensure_future(store.run(keys, book, replayable))
+    retry = asyncio.ensure_future(
+        store.run([("call", "tool-1")], book, replayable)
+    )
+    await asyncio.sleep(0)
+    book.release.set()
+
+    assert await first == ("booking 1", True)
+    assert await retry == ("booking 1", True)
+
+    # Any key of the finished request replays the stored result
+    later = await store.run([("booking", "abc")], book, replayable)
+    assert later == ("booking 1", True)
+    assert book.calls == 1
+
+
+async def test_rejected_results_are_not_replayed():
+    store = IdempotencyStore()
+    book = Booking(accepted=False)
+    book.release.set()
+
+    await store.run([("call", "tool-1")], book, replayable)
+    await store.run([("call", "tool-1")], book, replayable)
+    assert book.calls == 2
+
+
+async def test_cancelled_retry_does_not_cancel_the_booking():
+    store = IdempotencyStore()
+    book = Booking()
+
+    first = asyncio.ensure_future(store.run(["k"], book, replayable))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    book.release.set()
+
+    assert await store.run(["k"], book, replayable) == ("booking 1", True)
+    assert book.calls == 1
+
+
+async def test_results_expire_after_ttl():
+    store = IdempotencyStore(ttl=0)
+    book = Booking()
+    book.release.set()
+
+    await store.run(["k"], book, replayable)
+    await store.run(["k"], book, replayable)
+    assert book.calls == 2
+
+
+def test_idempotency_key_is_stable():
+    assert idempotency_key(1, "a@b.co", "2026-12-01T10:00:00Z") == (
+        idempotency_key(1, "a@b.co", "2026-12-01T10:00:00Z")
+    )
+    assert idempotency_key(1, "a@b.co") != idempotency_key(2, "a@b.co")
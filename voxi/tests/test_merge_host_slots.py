@@ -0,0 +1,47 @@
+from app.services.calendar_service import merge_host_slots
+
+
+def slots(*times):
+    return [{"time": f"2026-12-01T{t}:00+05:30"} for t in times]
+
+
+def starts(merged, day="2026-12-01"):
+    return [(slot["time"][11:16], slot["hosts"]) for slot in merged[day]]
+
+
+def test_merges_hosts_in_time_order_and_unions_shared_starts():
+    merged = merge_host_slots({
+        "alice": {"2026-12-01": slots("09:00", "10:00", "11:00")},
+        "bob": {"2026-12-01": slots("09:30", "10:00")},
+        "carol": {"2026-12-01": slots("10:00", "11:00", "12:00")},
+    })
+
+    assert starts(merged) == [
+        ("09:00", ["alice"]),
+        ("09:30", ["bob"]),
+        ("10:00", ["alice", "bob", "carol"]),
+        ("11:00", ["alice", "carol"]),
+        ("12:00", ["carol"]),
+    ]
+
+
+def test_same_instant_in_other_offsets_is_one_slot():
+    merged = merge_host_slots({
+        "alice": {"2026-12-01": [{"time": "2026-12-01T10:00:00+05:30"}]},
+        "bob": {"2026-12-01": [{"time": "2026-12-01T04:30:00Z"}]},
+    })
+
+    # The first host's slot is kept, annotated with both hosts
+    assert merged["2026-12-01"] == [
+        {"time": "2026-12-01T10:00:00+05:30", "hosts": ["alice", "bob"]}
+    ]
+
+
+def test_unsorted_and_unparseable_slots():
+    merged = merge_host_slots({
+        "alice": {"2026-12-01": slots("11:00", "09:00") + [{"time": None}]},
+        "bob": {"2026-12-02": [{"time": "2026-12-02T09:00:00Z"}]},
+    })
+
+    assert starts(merged) == [("09:00", ["alice"]), ("11:00", ["alice"])]
+    assert list(merged) == ["2026-12-01", "2026-12-02"]
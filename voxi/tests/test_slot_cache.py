@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from app.services.slot_cache import SlotCache
+
+KEY = ("2026-12-01", "2026-12-01", "30min", "UTC", "alice")
+pytestmark = pytest.mark.anyio
+
+
+class Upstream:
+    """
+    Fake fetch whose calls block until `release` is set.
+    """
+
+    def __init__(self, value="slots"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.value
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache = SlotCache()
+    fetch = Upstream()
+
+    waiters = [
+        asyncio.ensure_future(cache.get_or_fetch(KEY, fetch))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    fetch.release.set()
+
+    assert await asyncio.gather(*waiters) == ["slots"] * 5
+    assert fetch.calls == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+
+    assert await cache.get_or_fetch(KEY, fetch) == "slots"
+    assert fetch.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_invalidation_during_a_fetch_is_not_cached_over():
+    cache = SlotCache()
+    fetch = Upstream("before booking")
+
+    waiter = asyncio.ensure_future(cache.get_or_fetch(KEY, fetch))
+    await asyncio.sleep(0)
+    cache.invalidate_date("2026-12-01")
+    fetch.release.set()
+
+    # The caller still gets its answer, but it is not stored
+    assert await waiter == "before booking"
+    assert cache.get(KEY) is None
+
+    fresh = Upstream("after booking")
+    fresh.release.set()
+    assert await cache.get_or_fetch(KEY, fresh) == "after booking"
+    assert fresh.calls == 1
+
+
+async def test_uncacheable_results_are_fetched_again():
+    cache = SlotCache()
+    fetch = Upstream({"error": "request_failed"})
+    fetch.release.set()
+
+    for _ in range(2):
+        await cache.get_or_fetch(
+            KEY, fetch, cacheable=lambda value: "error" not in value
+        )
+    assert fetch.calls == 2
+
+
+def test_expired_entries_remain_as_stale_fallback():
+    cache = SlotCache(ttl=0.01)
+    cache.set(KEY, "slots")
+    stored_at, value = cache._entries[KEY]
+    cache._entries[KEY] = (stored_at - 1, value)
+
+    assert cache.get(KEY) is None
+    assert cache.get_stale(KEY, max_age=60) == "slots"
+    assert cache.get_stale(KEY, max_age=0.5) is None
+
+
+def test_set_with_an_old_generation_is_dropped():
+    cache = SlotCache()
+    generation = cache.generation
+    cache.invalidate_date("2026-12-01")
+
+    cache.set(KEY, "stale", generation)
+    assert cache.get(KEY) is None
+
+
+def test_lru_eviction_beyond_maxsize():
+    cache = SlotCache(maxsize=2)
+    keys = [(f"2026-12-0{d}",) * 2 for d in range(1, 4)]
+    cache.set(keys[0], 1)
+    cache.set(keys[1], 2)
+    cache.get(keys[0])
+    cache.set(keys[2], 3)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 1
+    assert cache.get(keys[2]) == 3
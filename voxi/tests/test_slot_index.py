@@ -0,0 +1,121 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+import pytest
+from app.services.slot_index import (
+    SlotIndex,
+    parse_spoken_day,
+    parse_spoken_time,
+    spoken_time_candidates,
+)
+
+TZ = ZoneInfo("Asia/Kolkata")
+DAY = date(2026, 12, 1)
+
+
+def at(hour, minute=0, second=0):
+    return datetime(2026, 12, 1, hour, minute, second, tzinfo=TZ)
+
+
+def index(*times):
+    return SlotIndex({
+        "2026-12-01": [
+            {"time": f"2026-12-01T{t}:00+05:30", "hosts": ["alice"]}
+            for t in times
+        ]
+    })
+
+
+def test_parse_spoken_day():
+    today = datetime.now(TZ).date()
+    assert parse_spoken_day("Today", TZ) == today
+    assert parse_spoken_day(" tomorrow ", TZ) == today + timedelta(days=1)
+    assert parse_spoken_day("2026-12-01", TZ) == DAY
+    assert parse_spoken_day("next week", TZ) is None
+    assert parse_spoken_day(None, TZ) is None
+
+
+@pytest.mark.parametrize("spoken, expected", [
+    ("3 pm", at(15)),
+    ("3:30 p.m.", at(15, 30)),
+    ("10 AM", at(10)),
+    ("15:30", at(15, 30)),
+    ("15:30:00", at(15, 30)),
+    ("09:15:30", at(9, 15, 30)),
+    ("12 am", at(0)),
+    ("12 pm", at(12)),
+    ("12", at(12)),
+    ("noon", at(12)),
+    ("Midnight", at(0)),
+    # No am/pm: 1 to 7 are afternoon hours, 8 to 11 morning ones
+    ("3", at(15)),
+    ("3 o'clock", at(15)),
+    ("7:30", at(19, 30)),
+    ("8", at(8)),
+    ("11:45", at(11, 45)),
+    # A leading zero is 24-hour time
+    ("03:00", at(3)),
+])
+def test_parse_spoken_time(spoken, expected):
+    assert parse_spoken_time(spoken, DAY, TZ) == expected
+
+
+@pytest.mark.parametrize("spoken", [
+    "13 pm", "0 am", "24:00", "10:60", "10:30:61", "half past", "", None,
+])
+def test_unparseable_times(spoken):
+    assert parse_spoken_time(spoken, DAY, TZ) is None
+
+
+def test_spoken_time_needs_a_day_iso_does_not():
+    assert parse_spoken_time("3 pm", None, TZ) is None
+    # An offset is converted into the caller's timezone
+    assert parse_spoken_time("2026-12-01T04:30:00Z", None, TZ) == at(10)
+    assert parse_spoken_time("2026-12-01T10:00:00+05:30", None, TZ) == at(10)
+    # A naive timestamp is taken in the caller's timezone
+    assert parse_spoken_time("2026-12-01T10:00:00", None, TZ) == at(10)
+    assert parse_spoken_time("2026-12-01Tnope", None, TZ) is None
+
+
+def test_ambiguous_hours_have_both_readings():
+    assert spoken_time_candidates("3", DAY, TZ) == [at(15), at(3)]
+    assert spoken_time_candidates("9:30", DAY, TZ) == [at(9, 30), at(21, 30)]
+    assert spoken_time_candidates("3 pm", DAY, TZ) == [at(15)]
+    assert spoken_time_candidates("15:00", DAY, TZ) == [at(15)]
+
+
+def test_choose_prefers_a_slot_then_a_half_day_with_slots():
+    afternoon = index("15:00", "16:00")
+    morning = index("07:00", "07:30")
+
+    assert afternoon.choose([at(15), at(3)]) == at(15)
+    # "7" with only morning slots is 7 am
+    assert morning.choose([at(19), at(7)]) == at(7)
+    # "7:15": no exact slot, but only the morning is open
+    assert morning.choose([at(19, 15), at(7, 15)]) == at(7, 15)
+    assert index().choose([at(15), at(3)]) == at(15)
+
+
+def test_match_exact_slot():
+    slots = index("09:00", "10:00", "11:00")
+    assert slots.match(at(10)) == (at(10), [])
+    assert slots.hosts(at(10)) == ["alice"]
+
+
+@pytest.mark.parametrize("when, nearest", [
+    # Before the first slot / after the last: the two at that end
+    (at(6), [at(9), at(10)]),
+    (at(20), [at(12), at(13)]),
+    # In between: nearest first, returned in time order
+    (at(10, 20), [at(10), at(11)]),
+    (at(10, 40), [at(10), at(11)]),
+    # Equal distance: the earlier slot wins the tie
+    (at(11, 30), [at(11), at(12)]),
+])
+def test_match_offers_nearest_alternatives(when, nearest):
+    slots = index("09:00", "10:00", "11:00", "12:00", "13:00")
+    assert slots.match(when) == (None, nearest)
+
+
+def test_match_on_a_day_without_slots():
+    assert index().match(at(10)) == (None, [])
+    assert index("09:00").match(at(10), alternatives=3) == (None, [at(9)])